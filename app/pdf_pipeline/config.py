@@ -2,7 +2,7 @@
 Configuration class for PDF processing pipeline
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple
 import os
 
@@ -15,6 +15,7 @@ class ProcessingConfig:
     output_dir: str = "output"
     create_main_text: bool = True
     create_manifest: bool = True
+    create_file_listing: bool = True  # file_listing.json; walks the whole output directory
     save_images: bool = True
     save_tables: bool = True
     
@@ -22,6 +23,7 @@ class ProcessingConfig:
     use_layout_detection: bool = True
     layout_model: str = "PubLayNet"  # "PubLayNet" or "TableBank"
     layout_confidence_threshold: float = 0.7
+    layout_quantization: str = "none"  # "none", "int8" (CPU) or "fp16" (CUDA)
     
     # Page region thresholds
     header_region_threshold: float = 0.1  # Top 10% of page
@@ -36,8 +38,11 @@ class ProcessingConfig:
     # Table extraction settings
     table_extraction_enabled: bool = True
     table_detection_method: str = "camelot"  # "camelot", "tabula", or "both"
-    camelot_flavor: str = "lattice"  # "lattice" or "stream"
+    camelot_flavor: str = "lattice"  # "lattice", "stream", or "both"
     table_accuracy_threshold: float = 80.0
+    table_output_formats: List[str] = field(default_factory=lambda: ["csv", "xlsx", "json"])  # Also "parquet", "dataset"
+    table_stream_threshold: int = 10000  # Cells above which Camelot tables stream to CSV
+    table_dedupe_threshold: float = 0.8  # IoU above which a stream table duplicates a lattice one
     
     # Image extraction settings
     image_extraction_enabled: bool = True
@@ -66,6 +71,8 @@ class ProcessingConfig:
     ocr_engine: str = "tesseract"  # "tesseract" or "easyocr"
     ocr_languages: List[str] = field(default_factory=lambda: ["eng"])
     ocr_fallback_threshold: float = 0.1  # Use OCR if <10% text extractable
+    ocr_target_dpi: int = 300  # Render resolution for OCR (capped at full-page scan resolution)
+    ocr_min_text_threshold: int = 20  # Skip OCR on pages with this many native chars
     
     # Content filtering
     min_sentence_length: int = 10
@@ -75,7 +82,7 @@ class ProcessingConfig:
     
     # Processing options
     parallel_processing: bool = True
-    max_workers: Optional[int] = None  # Use CPU count if None
+    max_workers: Optional[int] = None  # Use CPU count if None (at most 4 for page analysis)
     verbose: bool = False
     debug: bool = False
     
@@ -90,6 +97,9 @@ class ProcessingConfig:
         if self.layout_confidence_threshold < 0 or self.layout_confidence_threshold > 1:
             raise ValueError("layout_confidence_threshold must be between 0 and 1")
         
+        if self.layout_quantization not in ("none", "int8", "fp16"):
+            raise ValueError("layout_quantization must be 'none', 'int8' or 'fp16'")
+        
         if self.header_region_threshold >= self.footer_region_threshold:
             raise ValueError("header_region_threshold must be less than footer_region_threshold")
         
@@ -101,6 +111,10 @@ class ProcessingConfig:
         """Create config from dictionary"""
         return cls(**config_dict)
     
+    def replace(self, **changes) -> 'ProcessingConfig':
+        """Return a copy of the config with the given fields changed"""
+        return replace(self, **changes)
+    
     def to_dict(self) -> Dict:
         """Convert config to dictionary"""
         return {
@@ -0,0 +1,108 @@
+"""
+Faster text edge search for Camelot's stream flavor
+
+For every text line, Camelot's TextEdges.update calls find, which walks all
+edges of an alignment and compares each with np.isclose on plain floats. Stream
+parsing is therefore quadratic in the number of text lines, with most of the
+time spent in NumPy call overhead. patch_text_edges replaces find with a scalar
+comparison, and update with a binary search over the edges kept sorted by x.
+Results are unchanged: the comparison is np.isclose's own formula, and update
+still picks the earliest-added matching edge.
+"""
+
+import bisect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# np.isclose tolerances used by TextEdges.find
+_ATOL = 0.5
+_RTOL = 1e-05
+
+_ALIGNS = ('left', 'right', 'middle')
+
+# Names the original TextEdges.update must use for the replacement to be equivalent
+_UPDATE_NAMES = {'get_x_coord', 'find', 'add', 'update_coords'}
+
+
+def _is_close(a: float, b: float) -> bool:
+    """np.isclose(a, b, atol=0.5) for two floats"""
+    return abs(a - b) <= _ATOL + _RTOL * abs(b)
+
+
+def _find(self, x_coord, align):
+    """Index of the first edge of the alignment close to x_coord, or None"""
+    for i, te in enumerate(self._textedges[align]):
+        if _is_close(te.x, x_coord):
+            return i
+    return None
+
+
+def _sorted_edges(self, align):
+    """Edge x coordinates in sorted order with the matching edge indices"""
+    edges = self._textedges[align]
+    index = self.__dict__.setdefault('_sorted_edges', {}).get(align)
+    if index is None or len(index[1]) != len(edges):
+        # First use, or edges were added without going through update
+        order = sorted(range(len(edges)), key=lambda i: edges[i].x)
+        index = ([edges[i].x for i in order], order)
+        self._sorted_edges[align] = index
+    return index
+
+
+def _update(self, textline):
+    """TextEdges.update with a binary search for the matching edge"""
+    for align in _ALIGNS:
+        x_coord = self.get_x_coord(textline, align)
+        xs, ids = _sorted_edges(self, align)
+
+        # Search a slightly wider window than the tolerance, then apply the exact test
+        window = 2 * (_ATOL + _RTOL * abs(x_coord))
+        lo = bisect.bisect_left(xs, x_coord - window)
+        hi = bisect.bisect_right(xs, x_coord + window)
+        idx = None
+        idx_pos = None
+        for pos in range(lo, hi):
+            if _is_close(xs[pos], x_coord) and (idx is None or ids[pos] < idx):
+                idx = ids[pos]
+                idx_pos = pos
+
+        edges = self._textedges[align]
+        if idx is None:
+            self.add(textline, align)
+            idx = len(edges) - 1
+        else:
+            edges[idx].update_coords(x_coord, textline.y0, edge_tol=self.edge_tol)
+            if edges[idx].x == xs[idx_pos]:
+                continue
+            # The edge's x is a running mean, so it may have moved
+            del xs[idx_pos]
+            del ids[idx_pos]
+
+        pos = bisect.bisect_right(xs, edges[idx].x)
+        xs.insert(pos, edges[idx].x)
+        ids.insert(pos, idx)
+
+
+def patch_text_edges(text_edges_class) -> bool:
+    """
+    Replace find and update on Camelot's TextEdges class.
+
+    Only patches classes whose update matches the implementation this module
+    reproduces; returns whether the class was patched. The original methods are
+    kept in the class's _unpatched dict.
+    """
+    if getattr(text_edges_class, '_sorted_search', False):
+        return True
+
+    update = getattr(text_edges_class, 'update', None)
+    code = getattr(update, '__code__', None)
+    if code is None or not _UPDATE_NAMES <= set(code.co_names) or not hasattr(text_edges_class, 'find'):
+        logger.debug("Camelot TextEdges differs from the expected implementation; not patching")
+        return False
+
+    text_edges_class._unpatched = {'find': text_edges_class.find, 'update': update}
+    text_edges_class.find = _find
+    text_edges_class.update = _update
+    text_edges_class._sorted_search = True
+    return True
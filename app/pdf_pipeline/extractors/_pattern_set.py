@@ -0,0 +1,141 @@
+"""
+Multi-pattern matching for text classification
+
+Scans a line once and reports every pattern that matched as a bitmask. Uses
+Hyperscan or RE2's RE2::Set when one is installed; otherwise each pattern is
+tried in turn with the standard re module.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+try:
+    import re2
+    RE2_AVAILABLE = hasattr(re2, 'Set')
+except ImportError:
+    RE2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class PatternSet:
+    """
+    A fixed set of regular expressions and keyword groups matched together.
+
+    Pattern i sets bit (1 << i) of the result of scan(); keyword group j sets
+    bit (1 << (len(patterns) + j)) when any of its words occurs in the text,
+    ignoring case. Patterns are searched (not anchored), so anchored checks
+    should start with '^'.
+    """
+
+    def __init__(self, patterns: List[Tuple[str, bool]],
+                 keyword_groups: Optional[List[List[str]]] = None,
+                 prefilters: Optional[Dict[int, int]] = None):
+        """
+        Args:
+            patterns: (regex, ignore_case) pairs, in bit order
+            keyword_groups: Word lists matched as case-insensitive substrings
+            prefilters: Pattern index -> keyword group index that must have matched
+                for the pattern to match; lets the re backend skip the regex
+        """
+        self.patterns = patterns
+        self.keyword_groups = keyword_groups or []
+        self.prefilters = prefilters or {}
+        self.backend = 're'
+
+        # Keyword groups become case-insensitive alternations for the regex engines
+        self._all_patterns = patterns + [
+            ('|'.join(re.escape(word) for word in words), True)
+            for words in self.keyword_groups
+        ]
+
+        if HYPERSCAN_AVAILABLE:
+            try:
+                self._compile_hyperscan()
+                self.backend = 'hyperscan'
+            except Exception as e:
+                logger.debug(f"Hyperscan could not compile pattern set: {e}")
+
+        if self.backend == 're' and RE2_AVAILABLE:
+            try:
+                self._compile_re2()
+                self.backend = 're2'
+            except Exception as e:
+                logger.debug(f"RE2 could not compile pattern set: {e}")
+
+        if self.backend == 're':
+            self._compile_re()
+
+    def _compile_hyperscan(self):
+        """Build a block-mode Hyperscan database, one id per pattern"""
+        base_flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH
+        self._database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self._database.compile(
+            expressions=[pattern.encode('utf-8') for pattern, _ in self._all_patterns],
+            ids=list(range(len(self._all_patterns))),
+            elements=len(self._all_patterns),
+            flags=[
+                base_flags | (hyperscan.HS_FLAG_CASELESS if ignore_case else 0)
+                for _, ignore_case in self._all_patterns
+            ]
+        )
+
+    def _compile_re2(self):
+        """Build an unanchored RE2 set"""
+        self._re2_set = re2.Set.SearchSet(re2.Options())
+        for pattern, ignore_case in self._all_patterns:
+            self._re2_set.Add(f'(?i){pattern}' if ignore_case else pattern)
+        self._re2_set.Compile()
+
+    def _compile_re(self):
+        """Compile patterns and keyword groups for re"""
+        self._compiled = [
+            re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+            for pattern, ignore_case in self.patterns
+        ]
+        self._compiled_keywords = [
+            re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+            for words in self.keyword_groups
+        ]
+        self._prefilter_bits = [
+            1 << (len(self.patterns) + self.prefilters[pattern_id]) if pattern_id in self.prefilters else 0
+            for pattern_id in range(len(self.patterns))
+        ]
+
+    def scan(self, text: str) -> int:
+        """Return a bitmask of the patterns found in text"""
+        if self.backend == 'hyperscan':
+            matched = [0]
+
+            def on_match(pattern_id, start, end, flags, context):
+                matched[0] |= 1 << pattern_id
+
+            self._database.scan(text.encode('utf-8', 'replace'), match_event_handler=on_match)
+            return matched[0]
+
+        if self.backend == 're2':
+            mask = 0
+            for pattern_id in self._re2_set.Match(text):
+                mask |= 1 << pattern_id
+            return mask
+
+        # Keyword groups first, so prefiltered patterns can be skipped
+        mask = 0
+        for group_id, pattern in enumerate(self._compiled_keywords):
+            if pattern.search(text):
+                mask |= 1 << (len(self.patterns) + group_id)
+
+        for pattern_id, pattern in enumerate(self._compiled):
+            required = self._prefilter_bits[pattern_id]
+            if required and not mask & required:
+                continue
+            if pattern.search(text):
+                mask |= 1 << pattern_id
+        return mask
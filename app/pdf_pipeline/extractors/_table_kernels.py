@@ -0,0 +1,47 @@
+"""
+Numeric kernels for table extraction
+
+Compiled with Numba when it is installed; otherwise they run as plain Python.
+Callers convert DataFrame contents to NumPy arrays before calling these.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def is_header_row(first_row_lengths, name_lengths, unnamed_mask):
+    """
+    Decide whether a table's first row or column names form a header.
+
+    Args:
+        first_row_lengths: Stripped length of each first-row cell (0 for non-strings)
+        name_lengths: Stripped length of each column name (0 for non-strings)
+        unnamed_mask: True where the column name is a generated "Unnamed" label
+    """
+    n_columns = first_row_lengths.shape[0]
+
+    # Headers are typically strings: 70% of columns have string values
+    str_count = 0
+    for i in range(n_columns):
+        if first_row_lengths[i] > 0:
+            str_count += 1
+    if str_count > n_columns * 0.7:
+        return True
+
+    # Or the column names look meaningful: 50% of columns
+    meaningful = 0
+    for i in range(name_lengths.shape[0]):
+        if name_lengths[i] > 2 and not unnamed_mask[i]:
+            meaningful += 1
+    return meaningful > name_lengths.shape[0] * 0.5
+
@@ -0,0 +1,137 @@
+"""
+Numeric kernels for text classification
+
+Compiled with Numba when it is installed; otherwise they run as plain Python.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def find_region(center_x, center_y, bboxes):
+    """
+    Index of the first [x0, y0, x1, y1] row of bboxes containing the point, or -1.
+
+    Args:
+        center_x: Point x coordinate
+        center_y: Point y coordinate
+        bboxes: (N, 4) float64 array of region boxes
+    """
+    for i in range(bboxes.shape[0]):
+        if (bboxes[i, 0] <= center_x <= bboxes[i, 2] and
+                bboxes[i, 1] <= center_y <= bboxes[i, 3]):
+            return i
+    return -1
+
+
+# Line feature bits for label_lines
+FEATURE_SHORT = 1            # Text of at most 10 characters
+FEATURE_LAYOUT_CAPTION = 2   # Layout region type contains "caption"
+FEATURE_LAYOUT_TITLE = 4     # Layout region type is "title"
+FEATURE_TITLE_WORD = 8       # Contains a title indicator word
+FEATURE_BOLD = 16            # Any span is bold
+
+# Label codes returned by label_lines, in rule priority order after body
+LABEL_BODY = 0
+LABEL_PAGE_NUMBER = 1
+LABEL_HEADER = 2
+LABEL_FOOTER = 3
+LABEL_FOOTNOTE = 4
+LABEL_CAPTION = 5
+LABEL_LIST = 6
+LABEL_TITLE = 7
+
+
+@njit(cache=True)
+def _label_lines_loop(y0, y1, avg_sizes, features, matches, pattern_bits, thresholds):
+    """Compiled rule cascade; one pass, first matching rule wins"""
+    page_bit, footnote_bits, caption_bit, list_bits = pattern_bits[0], pattern_bits[1], pattern_bits[2], pattern_bits[3]
+    header_y, footer_y, footnote_y = thresholds[0], thresholds[1], thresholds[2]
+    footnote_size_max, title_size_min = thresholds[3], thresholds[4]
+
+    labels = np.zeros(y0.shape[0], dtype=np.int8)
+    for i in range(y0.shape[0]):
+        f = features[i]
+        m = matches[i]
+        in_header = y0[i] < header_y
+        in_header_footer = in_header or y0[i] > footer_y
+
+        if (f & FEATURE_SHORT) and (m & page_bit) and in_header_footer:
+            labels[i] = LABEL_PAGE_NUMBER
+        elif in_header:
+            labels[i] = LABEL_HEADER
+        elif in_header_footer:
+            labels[i] = LABEL_FOOTER
+        elif y1[i] >= footnote_y and avg_sizes[i] <= footnote_size_max and (m & footnote_bits):
+            labels[i] = LABEL_FOOTNOTE
+        elif (f & FEATURE_LAYOUT_CAPTION) or (m & caption_bit):
+            labels[i] = LABEL_CAPTION
+        elif m & list_bits:
+            labels[i] = LABEL_LIST
+        elif (f & (FEATURE_LAYOUT_TITLE | FEATURE_TITLE_WORD | FEATURE_BOLD)) or avg_sizes[i] >= title_size_min:
+            labels[i] = LABEL_TITLE
+    return labels
+
+
+def _label_lines_vectorized(y0, y1, avg_sizes, features, matches, pattern_bits, thresholds):
+    """NumPy equivalent of _label_lines_loop for when Numba is not installed"""
+    page_bit, footnote_bits, caption_bit, list_bits = pattern_bits
+    header_y, footer_y, footnote_y, footnote_size_max, title_size_min = thresholds
+
+    in_header = y0 < header_y
+    in_header_footer = in_header | (y0 > footer_y)
+    conditions = [
+        ((features & FEATURE_SHORT) != 0) & ((matches & page_bit) != 0) & in_header_footer,
+        in_header,
+        in_header_footer,
+        (y1 >= footnote_y) & (avg_sizes <= footnote_size_max) & ((matches & footnote_bits) != 0),
+        ((features & FEATURE_LAYOUT_CAPTION) != 0) | ((matches & caption_bit) != 0),
+        (matches & list_bits) != 0,
+        ((features & (FEATURE_LAYOUT_TITLE | FEATURE_TITLE_WORD | FEATURE_BOLD)) != 0) | (avg_sizes >= title_size_min),
+    ]
+    choices = [LABEL_PAGE_NUMBER, LABEL_HEADER, LABEL_FOOTER, LABEL_FOOTNOTE,
+               LABEL_CAPTION, LABEL_LIST, LABEL_TITLE]
+    return np.select(conditions, choices, default=LABEL_BODY).astype(np.int8)
+
+
+def label_lines(y0, y1, avg_sizes, features, matches, pattern_bits, thresholds):
+    """
+    Label each line of a page with the first classification rule it satisfies.
+
+    Args:
+        y0, y1: Line top and bottom coordinates (float64)
+        avg_sizes: Average span font size per line (float64)
+        features: FEATURE_* bitmask per line (int64)
+        matches: Pattern-set bitmask per line (int64)
+        pattern_bits: int64 array of the page-number, footnote/citation, caption and list bits
+        thresholds: float64 array of header_y, footer_y, footnote_y, the largest footnote
+            font size and the smallest title font size (inf disables the size rules)
+
+    Returns:
+        int8 array of LABEL_* codes
+    """
+    if NUMBA_AVAILABLE:
+        return _label_lines_loop(y0, y1, avg_sizes, features, matches, pattern_bits, thresholds)
+    return _label_lines_vectorized(y0, y1, avg_sizes, features, matches, pattern_bits, thresholds)
+
+
+def warm_up():
+    """Compile the kernels ahead of the first page"""
+    if NUMBA_AVAILABLE:
+        find_region(0.0, 0.0, np.zeros((1, 4), dtype=np.float64))
+        empty_f = np.zeros(1, dtype=np.float64)
+        empty_i = np.zeros(1, dtype=np.int64)
+        _label_lines_loop(empty_f, empty_f, empty_f, empty_i, empty_i,
+                          np.zeros(4, dtype=np.int64), np.zeros(5, dtype=np.float64))
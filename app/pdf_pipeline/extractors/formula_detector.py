@@ -113,12 +113,28 @@ class FormulaDetector:
             page_num: Page number (0-indexed)
             results: Results dictionary to update
         """
+        self.save_formulas(self.find_formulas(page, page_num), page_num, results)
+    
+    def find_formulas(self, page, page_num: int, text_dict: Optional[Dict] = None) -> List[Dict]:
+        """
+        Find and validate the formulas on a PDF page without saving them.
+        
+        Depends only on the page, so pages can be searched in worker processes;
+        save_formulas then numbers and saves them in page order.
+        
+        Args:
+            page: PyMuPDF page object
+            page_num: Page number (0-indexed)
+            text_dict: The page's text dict, if already extracted; image blocks
+                are skipped, so it may be extracted without them
+        """
         if not self.config.formula_detection_enabled:
-            return
+            return []
         
         try:
             # Get text with detailed formatting
-            text_dict = page.get_text("dict")
+            if text_dict is None:
+                text_dict = page.get_text("dict")
             
             # Detect formulas in text spans
             formula_candidates = []
@@ -131,16 +147,18 @@ class FormulaDetector:
                 formula_candidates.extend(candidates)
             
             # Filter and validate candidates
-            validated_formulas = self._validate_formula_candidates(formula_candidates)
-            
-            # Save formulas
-            for formula_info in validated_formulas:
-                self._save_formula(formula_info, page_num, results)
-            
-            logger.debug(f"Detected {len(validated_formulas)} formulas on page {page_num}")
+            return self._validate_formula_candidates(formula_candidates)
             
         except Exception as e:
             logger.error(f"Formula detection failed for page {page_num}: {e}")
+            return []
+    
+    def save_formulas(self, validated_formulas: List[Dict], page_num: int, results: Dict):
+        """Save the formulas found on a page"""
+        for formula_info in validated_formulas:
+            self._save_formula(formula_info, page_num, results)
+        
+        logger.debug("Detected %d formulas on page %d", len(validated_formulas), page_num)
     
     def _detect_formulas_in_block(self, block: Dict, page_num: int) -> List[Dict]:
         """Detect formula candidates in a text block"""
@@ -360,7 +378,7 @@ class FormulaDetector:
             # Add to results
             results['content']['formulas'].append(formula_entry)
             
-            logger.debug(f"Saved formula: {formula_info['text'][:50]}...")
+            logger.debug("Saved formula: %.50s...", formula_info['text'])
             
         except Exception as e:
             logger.error(f"Failed to save formula: {e}")
@@ -18,6 +18,7 @@ except ImportError:
     np = None
 
 from ..config import ProcessingConfig
+from ..utils.page_bundle import PageBundle
 
 logger = logging.getLogger(__name__)
 
@@ -55,19 +56,43 @@ class ImageExtractor:
             page_num: Page number (0-indexed)
             results: Results dictionary to update
         """
+        self.save_images(self.find_images(page, page_num), page_num, results)
+    
+    def find_images(self, page, page_num: int, bundle: Optional[PageBundle] = None) -> List[Dict]:
+        """
+        Find the embedded and vector images on a PDF page without saving them.
+        
+        Depends only on the page, so pages can be searched in worker processes;
+        save_images then filters, deduplicates and saves them in page order.
+        
+        Args:
+            page: PyMuPDF page object
+            page_num: Page number (0-indexed)
+            bundle: The page's shared extractions, if other extractors use them too
+        """
         if not self.config.image_extraction_enabled:
-            return
+            return []
+        
+        if bundle is None:
+            bundle = PageBundle(page)
         
         try:
             # Extract embedded images
-            embedded_images = self._extract_embedded_images(page, page_num)
+            embedded_images = self._extract_embedded_images(bundle, page_num)
             
             # Extract vector graphics as images if needed
-            vector_images = self._extract_vector_graphics(page, page_num)
+            vector_images = self._extract_vector_graphics(bundle, page_num)
             
             # Combine and process all images
-            all_images = embedded_images + vector_images
+            return embedded_images + vector_images
             
+        except Exception as e:
+            logger.error(f"Image extraction failed for page {page_num}: {e}")
+            return []
+    
+    def save_images(self, all_images: List[Dict], page_num: int, results: Dict):
+        """Filter, deduplicate and save the images found on a page"""
+        try:
             # Filter and save images
             for image_info in all_images:
                 if self._should_save_image(image_info):
@@ -87,18 +112,19 @@ class ImageExtractor:
                         results['content']['images'].append(image_entry)
                         results['artifacts']['images'].append(str(saved_path))
             
-            logger.debug(f"Extracted {len(all_images)} images from page {page_num}")
+            logger.debug("Extracted %d images from page %d", len(all_images), page_num)
             
         except Exception as e:
             logger.error(f"Image extraction failed for page {page_num}: {e}")
     
-    def _extract_embedded_images(self, page, page_num: int) -> List[Dict]:
+    def _extract_embedded_images(self, bundle: PageBundle, page_num: int) -> List[Dict]:
         """Extract embedded raster images from the page"""
         images = []
+        page = bundle.page
         
         try:
             # Get image list from page
-            image_list = page.get_images(full=True)
+            image_list = bundle.images
             
             for img_index, img in enumerate(image_list):
                 xref = img[0]  # Cross-reference number
@@ -108,13 +134,8 @@ class ImageExtractor:
                 image_bytes = base_image["image"]
                 image_ext = base_image["ext"]
                 
-                # Get image info
-                image_info = page.get_image_info()
-                bbox = None
-                for info in image_info:
-                    if info.get("xref") == xref:
-                        bbox = info.get("bbox")
-                        break
+                # Get image placement (image info is read once per page)
+                bbox = bundle.image_bboxes.get(xref)
                 
                 # Create PIL Image to get additional info
                 try:
@@ -145,16 +166,17 @@ class ImageExtractor:
         
         return images
     
-    def _extract_vector_graphics(self, page, page_num: int) -> List[Dict]:
+    def _extract_vector_graphics(self, bundle: PageBundle, page_num: int) -> List[Dict]:
         """Extract vector graphics by rendering specific regions"""
         images = []
+        page = bundle.page
         
         if not self.config.save_image_formats or 'vector' not in self.config.save_image_formats:
             return images
         
         try:
             # Look for drawing objects that might be vector graphics
-            drawings = page.get_drawings()
+            drawings = bundle.drawings
             
             if not drawings:
                 return images
@@ -332,7 +354,7 @@ class ImageExtractor:
                     pil_image = Image.open(io.BytesIO(image_bytes))
                     pil_image.save(file_path, format=format_name.upper())
             
-            logger.debug(f"Saved image: {file_path}")
+            logger.debug("Saved image: %s", file_path)
             return file_path
             
         except Exception as e:
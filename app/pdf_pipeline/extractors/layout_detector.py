@@ -3,6 +3,7 @@ Layout detection using PubLayNet via layoutparser
 """
 
 import logging
+from contextlib import nullcontext
 from typing import List, Dict, Optional, Tuple
 
 try:
@@ -43,6 +44,7 @@ class LayoutDetector:
     def __init__(self, config: ProcessingConfig):
         self.config = config
         self.model = None
+        self._half_precision = False
         
         if not LAYOUT_AVAILABLE:
             raise ImportError(
@@ -80,6 +82,48 @@ class LayoutDetector:
         except Exception as e:
             logger.error(f"Failed to load layout model: {e}")
             self.model = None
+        
+        if self.model is not None and self.config.layout_quantization != "none":
+            self._quantize_model()
+    
+    def _quantize_model(self):
+        """
+        Run the layout model at reduced precision.
+        
+        "int8" dynamically quantizes the model's linear layers (the box and mask
+        heads) for CPU inference; "fp16" runs inference under CUDA autocast.
+        Falls back to full precision if the mode does not suit the device.
+        """
+        mode = self.config.layout_quantization
+        predictor = getattr(self.model, 'model', None)
+        network = getattr(predictor, 'model', None)
+        if network is None:
+            logger.warning("Layout model does not expose its network, running at full precision")
+            return
+        
+        try:
+            device = next(network.parameters()).device.type
+            if mode == "int8":
+                if device != 'cpu':
+                    logger.warning(f"int8 layout quantization needs a CPU model, not {device}; running at full precision")
+                    return
+                predictor.model = torch.quantization.quantize_dynamic(
+                    network, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            elif mode == "fp16":
+                if device != 'cuda':
+                    logger.warning(f"fp16 layout inference needs a CUDA model, not {device}; running at full precision")
+                    return
+                self._half_precision = True
+            logger.info(f"Layout model running with {mode} precision")
+        except Exception as e:
+            logger.warning(f"Failed to quantize layout model, running at full precision: {e}")
+    
+    def _inference_context(self):
+        """Context for running the layout model at the configured precision"""
+        if self._half_precision:
+            return torch.autocast('cuda', dtype=torch.float16)
+        return nullcontext()
     
     def detect_layout(self, page, page_num: int) -> List[Dict]:
         """
@@ -103,7 +147,8 @@ class LayoutDetector:
                 return []
             
             # Run layout detection
-            layout_result = self.model.detect(page_image)
+            with self._inference_context():
+                layout_result = self.model.detect(page_image)
             
             # Convert results to our format
             regions = []
@@ -118,7 +163,7 @@ class LayoutDetector:
                 }
                 regions.append(region)
             
-            logger.debug(f"Detected {len(regions)} layout regions on page {page_num}")
+            logger.debug("Detected %d layout regions on page %d", len(regions), page_num)
             return regions
             
         except Exception as e:
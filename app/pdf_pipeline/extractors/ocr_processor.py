@@ -2,11 +2,12 @@
 OCR processing for scanned PDF documents
 """
 
+import json
 import logging
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple, Union
-import io
 
 try:
     import fitz  # PyMuPDF
@@ -27,15 +28,19 @@ except ImportError:
     EASYOCR_AVAILABLE = False
 
 try:
-    import cv2
     import numpy as np
-    CV2_AVAILABLE = True
 except ImportError:
-    CV2_AVAILABLE = False
-    # Create dummy imports for type hints
+    # Create dummy import for type hints
     class np:
         class ndarray:
             pass
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    CV2_AVAILABLE = False
+    # Create dummy import for type hints
     class cv2:
         pass
 
@@ -43,6 +48,9 @@ from ..config import ProcessingConfig
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct image shapes kept in the per-processor buffer pool
+_BUFFER_POOL_SIZE = 4
+
 
 class OCRProcessor:
     """
@@ -63,6 +71,10 @@ class OCRProcessor:
         
         # Check available OCR engines
         self.available_engines = []
+        self._active_engine = None
+        
+        # Reusable image buffers keyed by (shape, dtype), least recently used first
+        self._buffer_pool = OrderedDict()
         if TESSERACT_AVAILABLE and self.config.ocr_enabled:
             self.available_engines.append('tesseract')
         if EASYOCR_AVAILABLE and self.config.ocr_enabled:
@@ -76,6 +88,20 @@ class OCRProcessor:
         self.ocr_engines = {}
         self._initialize_engines()
         
+        # Resolve the OCR engine once rather than on every page
+        if self.config.ocr_engine in self.available_engines:
+            self._active_engine = self.config.ocr_engine
+        elif self.available_engines:
+            self._active_engine = self.available_engines[0]  # Use first available
+        self._run_ocr = (
+            self._run_tesseract_ocr if self._active_engine == 'tesseract'
+            else self._run_easyocr_ocr
+        )
+        
+        # Tesseract arguments are constant for the whole document
+        self._tess_lang = '+'.join(self.config.ocr_languages)
+        self._tess_config = '--oem 3 --psm 6'  # Use LSTM and assume uniform text block
+        
         # Create OCR output directory
         self.ocr_dir = Path(self.config.output_dir) / "ocr"
         self.ocr_dir.mkdir(parents=True, exist_ok=True)
@@ -120,6 +146,14 @@ class OCRProcessor:
             
             for page_num in range(document.page_count):
                 page = document[page_num]
+                
+                # Pages with embedded text don't need OCR
+                native_text = page.get_text("text").strip()
+                if len(native_text) >= self.config.ocr_min_text_threshold:
+                    logger.debug(f"Page {page_num + 1} has extractable text, skipping OCR")
+                    self._add_native_text_to_document(page, page_num, results)
+                    continue
+                
                 logger.debug(f"OCR processing page {page_num + 1}")
                 
                 # Process page with OCR
@@ -136,25 +170,23 @@ class OCRProcessor:
     def _process_page_with_ocr(self, page, page_num: int) -> List[Dict]:
         """Process a single page with OCR"""
         ocr_results = []
+        page_image = processed_image = None
         
         try:
             # Convert page to image
-            page_image = self._page_to_image(page)
+            zoom = self._ocr_zoom(page)
+            page_image = self._page_to_image(page, zoom)
             if page_image is None:
                 return ocr_results
             
             # Preprocess image for better OCR
             processed_image = self._preprocess_image(page_image)
             
-            # Run OCR with selected engine
-            engine = self.config.ocr_engine
-            if engine not in self.available_engines:
-                engine = self.available_engines[0]  # Use first available
+            # Run OCR with the engine resolved at init
+            ocr_results = self._run_ocr(processed_image, page_num)
             
-            if engine == 'tesseract':
-                ocr_results = self._run_tesseract_ocr(processed_image, page_num)
-            elif engine == 'easyocr':
-                ocr_results = self._run_easyocr_ocr(processed_image, page_num)
+            # Zoom differs from page to page, so report positions in PDF points
+            self._scale_to_points(ocr_results, zoom)
             
             # Save processed image for debugging if needed
             if self.config.debug:
@@ -163,25 +195,64 @@ class OCRProcessor:
         except Exception as e:
             logger.error(f"OCR processing failed for page {page_num}: {e}")
         
+        finally:
+            # Hand page-sized buffers back for the next page
+            if processed_image is not None and processed_image is not page_image:
+                self._release_buffer(processed_image)
+            if page_image is not None:
+                self._release_buffer(page_image)
+        
         return ocr_results
     
-    def _page_to_image(self, page) -> Optional[np.ndarray]:
-        """Convert PDF page to image for OCR"""
+    def _scale_to_points(self, ocr_results: List[Dict], zoom: float):
+        """Convert OCR positions from render pixels to PDF points, in place"""
+        for ocr_result in ocr_results:
+            ocr_result['bbox'] = [v / zoom for v in ocr_result['bbox']]
+            if 'original_bbox' in ocr_result:
+                ocr_result['original_bbox'] = [[x / zoom, y / zoom] for x, y in ocr_result['original_bbox']]
+    
+    def _get_buffer(self, shape: Tuple[int, ...], dtype=None) -> np.ndarray:
+        """Get an uninitialized array from the buffer pool"""
+        dtype = np.dtype(dtype or np.uint8)
+        key = (tuple(shape), dtype.str)
+        
+        free = self._buffer_pool.get(key)
+        if free:
+            self._buffer_pool.move_to_end(key)
+            return free.pop()
+        return np.empty(shape, dtype=dtype)
+    
+    def _release_buffer(self, array: np.ndarray):
+        """Return an array obtained from _get_buffer to the pool"""
+        key = (array.shape, array.dtype.str)
+        free = self._buffer_pool.setdefault(key, [])
+        self._buffer_pool.move_to_end(key)
+        if len(free) < _BUFFER_POOL_SIZE:
+            free.append(array)
+        
+        # Drop the least recently used shapes
+        while len(self._buffer_pool) > _BUFFER_POOL_SIZE:
+            self._buffer_pool.popitem(last=False)
+    
+    def _page_to_image(self, page, zoom: float) -> Optional[np.ndarray]:
+        """Convert PDF page to image for OCR, rendered at zoom pixels per PDF point"""
         try:
             # Get page as high-resolution pixmap
-            mat = fitz.Matrix(2.0, 2.0)  # 2x zoom for better OCR
+            mat = fitz.Matrix(zoom, zoom)
             pix = page.get_pixmap(matrix=mat)
             
-            # Convert to PIL Image
-            img_data = pix.tobytes("ppm")
-            pil_image = Image.open(io.BytesIO(img_data))
-            
-            # Convert to numpy array
-            image_array = np.array(pil_image)
+            # View the raw samples without an intermediate image encode
+            samples = np.frombuffer(pix.samples, dtype=np.uint8)
+            samples = samples.reshape(pix.height, pix.width, pix.n)
             
             # Convert RGB to BGR for OpenCV compatibility
-            if len(image_array.shape) == 3:
-                image_array = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
+            if pix.n == 1:
+                image_array = self._get_buffer((pix.height, pix.width))
+                np.copyto(image_array, samples[:, :, 0])
+            else:
+                code = cv2.COLOR_RGB2BGR if pix.n == 3 else cv2.COLOR_RGBA2BGR
+                image_array = self._get_buffer((pix.height, pix.width, 3))
+                cv2.cvtColor(samples, code, dst=image_array)
             
             return image_array
             
@@ -189,30 +260,55 @@ class OCRProcessor:
             logger.error(f"Failed to convert page to image: {e}")
             return None
     
+    def _ocr_zoom(self, page) -> float:
+        """Choose a render zoom that targets the OCR DPI without oversampling scans"""
+        target_dpi = self.config.ocr_target_dpi
+        
+        try:
+            # PDF units are 1/72 inch; only a scan covering most of the page limits the
+            # resolution, so small placed images such as logos are ignored
+            page_area = page.rect.width * page.rect.height
+            scan_dpis = []
+            for info in page.get_image_info():
+                x0, y0, x1, y1 = info['bbox']
+                placed_width = x1 - x0
+                if placed_width > 0 and placed_width * (y1 - y0) >= 0.5 * page_area > 0:
+                    scan_dpis.append(info['width'] / (placed_width / 72))
+            if scan_dpis:
+                target_dpi = min(target_dpi, max(scan_dpis))
+        except Exception as e:
+            logger.debug(f"Could not determine page resolution: {e}")
+        
+        return min(max(target_dpi / 72, 1.0), 2.5)
+    
     def _preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Preprocess image for better OCR results"""
         if not CV2_AVAILABLE:
             return image
         
         try:
+            shape = image.shape[:2]
+            
             # Convert to grayscale if needed
             if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._get_buffer(shape))
             else:
-                gray = image.copy()
+                gray = image
             
             # Apply preprocessing steps
             # 1. Noise reduction
-            denoised = cv2.medianBlur(gray, 3)
+            denoised = cv2.medianBlur(gray, 3, dst=self._get_buffer(shape))
+            if gray is not image:
+                self._release_buffer(gray)
             
             # 2. Threshold to binary
-            _, binary = cv2.threshold(denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            # 3. Dilation and erosion to improve text connectivity
-            kernel = np.ones((1, 1), np.uint8)
-            processed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+            _, binary = cv2.threshold(
+                denoised, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+                dst=self._get_buffer(shape)
+            )
+            self._release_buffer(denoised)
             
-            return processed
+            return binary
             
         except Exception as e:
             logger.warning(f"Image preprocessing failed: {e}")
@@ -229,25 +325,28 @@ class OCRProcessor:
             else:
                 pil_image = Image.fromarray(image)
             
-            # Configure Tesseract
-            config = '--oem 3 --psm 6'  # Use LSTM and assume uniform text block
-            
-            # Get detailed OCR data
-            data = pytesseract.image_to_data(
+            # Get detailed OCR data as raw TSV rather than pytesseract's column dict
+            tsv = pytesseract.image_to_data(
                 pil_image, 
-                lang='+'.join(self.config.ocr_languages),
-                config=config,
-                output_type=pytesseract.Output.DICT
+                lang=self._tess_lang,
+                config=self._tess_config,
+                output_type=pytesseract.Output.STRING
             )
             
-            # Process OCR results
-            n_boxes = len(data['text'])
-            for i in range(n_boxes):
-                text = data['text'][i].strip()
-                conf = int(data['conf'][i])
+            # Process OCR results in a single pass over the TSV rows:
+            # level page block par line word left top width height conf text
+            for row in tsv.splitlines()[1:]:
+                fields = row.split('\t', 11)
+                if len(fields) < 12:
+                    continue
                 
-                if text and conf > 0:  # Filter out empty text and low confidence
-                    x, y, w, h = data['left'][i], data['top'][i], data['width'][i], data['height'][i]
+                text = fields[11].strip()
+                if not text:
+                    continue
+                
+                conf = int(float(fields[10]))
+                if conf > 0:  # Filter out low confidence
+                    x, y, w, h = (int(v) for v in fields[6:10])
                     
                     ocr_result = {
                         'text': text,
@@ -255,10 +354,10 @@ class OCRProcessor:
                         'confidence': conf,
                         'page': page_num,
                         'engine': 'tesseract',
-                        'word_num': data['word_num'][i],
-                        'line_num': data['line_num'][i],
-                        'par_num': data['par_num'][i],
-                        'block_num': data['block_num'][i]
+                        'word_num': int(fields[5]),
+                        'line_num': int(fields[4]),
+                        'par_num': int(fields[3]),
+                        'block_num': int(fields[2])
                     }
                     ocr_results.append(ocr_result)
             
@@ -276,17 +375,18 @@ class OCRProcessor:
             
             # Run OCR
             results = reader.readtext(image)
+            if not results:
+                return ocr_results
+            
+            # Convert all quadrilaterals to [x0, y0, x1, y1] at once
+            quads = np.asarray([result[0] for result in results])  # (N, 4, 2)
+            bboxes = np.concatenate([quads.min(axis=1), quads.max(axis=1)], axis=1).tolist()
             
             # Process results
-            for result in results:
+            for result, bbox in zip(results, bboxes):
                 bbox_coords, text, confidence = result
                 
                 if text.strip() and confidence > 0.1:  # Filter low confidence
-                    # Convert bbox format
-                    x_coords = [point[0] for point in bbox_coords]
-                    y_coords = [point[1] for point in bbox_coords]
-                    bbox = [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
-                    
                     ocr_result = {
                         'text': text.strip(),
                         'bbox': bbox,
@@ -309,6 +409,7 @@ class OCRProcessor:
         text_blocks = self._group_ocr_into_blocks(ocr_results)
         
         # Add to results
+        append_block = results['content']['text_blocks'].append
         for block in text_blocks:
             text_entry = {
                 'type': 'body',  # Default to body text
@@ -320,11 +421,36 @@ class OCRProcessor:
                 'confidence': block.get('confidence'),
                 'word_count': len(block['text'].split())
             }
-            results['content']['text_blocks'].append(text_entry)
+            append_block(text_entry)
         
         # Save raw OCR data
         self._save_ocr_data(ocr_results, page_num)
     
+    def _add_native_text_to_document(self, page, page_num: int, results: Dict):
+        """
+        Add embedded text blocks from a page that was not OCR'd.
+        
+        Like OCR blocks, their bboxes are in PDF points, so both kinds can be
+        compared by reading order, caption matching and header/footer detection.
+        """
+        append_block = results['content']['text_blocks'].append
+        for x0, y0, x1, y1, text, _, block_type in page.get_text("blocks"):
+            text = text.strip()
+            if block_type != 0 or not text:  # Skip image blocks
+                continue
+            
+            text_entry = {
+                'type': 'body',
+                'text': text,
+                'page': page_num,
+                'bbox': [x0, y0, x1, y1],
+                'source': 'native',
+                'engine': None,
+                'confidence': None,
+                'word_count': len(text.split())
+            }
+            append_block(text_entry)
+    
     def _group_ocr_into_blocks(self, ocr_results: List[Dict]) -> List[Dict]:
         """Group individual OCR words into coherent text blocks"""
         if not ocr_results:
@@ -386,12 +512,12 @@ class OCRProcessor:
                 abs(ocr_bbox[1] - block_bbox[3]),
                 abs(ocr_bbox[3] - block_bbox[1])
             )
-            if vertical_distance > 20:  # More than 20 pixels apart vertically
+            if vertical_distance > 10:  # More than 10 points apart vertically
                 return False
         
         # Horizontal distance check
         horizontal_distance = max(0, ocr_bbox[0] - block_bbox[2])
-        if horizontal_distance > 50:  # More than 50 pixels apart horizontally
+        if horizontal_distance > 25:  # More than 25 points apart horizontally
             return False
         
         # Don't merge if block is getting too long
@@ -415,8 +541,6 @@ class OCRProcessor:
             return
         
         try:
-            import json
-            
             ocr_file = self.ocr_dir / f"page_{page_num:03d}_ocr_data.json"
             with open(ocr_file, 'w', encoding='utf-8') as f:
                 json.dump(ocr_results, f, indent=2, ensure_ascii=False)
@@ -428,7 +552,8 @@ class OCRProcessor:
         """Save processed image for debugging"""
         try:
             debug_file = self.ocr_dir / f"page_{page_num:03d}_processed.png"
-            cv2.imwrite(str(debug_file), image)
+            # Debug dumps favour encode speed over file size
+            cv2.imwrite(str(debug_file), image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
             
         except Exception as e:
             logger.debug(f"Failed to save debug image: {e}")
@@ -439,18 +564,23 @@ class OCRProcessor:
             return {'overall_quality': 0.0, 'details': {}}
         
         # Calculate average confidence
-        confidences = [r['confidence'] for r in ocr_results if 'confidence' in r]
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        confidences = np.fromiter(
+            (r['confidence'] for r in ocr_results if 'confidence' in r), dtype=np.float64
+        )
+        avg_confidence = float(confidences.mean()) if confidences.size else 0
         
-        # Count words and characters
+        # Count words and characters (OCR text is stripped by the engine runners)
         total_words = len(ocr_results)
-        total_chars = sum(len(r['text']) for r in ocr_results)
+        text_lengths = np.fromiter(
+            (len(r['text']) for r in ocr_results), dtype=np.int64, count=total_words
+        )
+        total_chars = int(text_lengths.sum())
         
         # Estimate quality based on various factors
         quality_score = avg_confidence / 100  # Normalize to 0-1
         
         # Penalize for very short words (likely OCR errors)
-        short_words = sum(1 for r in ocr_results if len(r['text'].strip()) <= 2)
+        short_words = int((text_lengths <= 2).sum())
         if total_words > 0:
             short_word_ratio = short_words / total_words
             quality_score *= (1 - short_word_ratio * 0.5)
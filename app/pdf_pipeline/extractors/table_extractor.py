@@ -2,17 +2,32 @@
 Table extraction from PDF documents using Camelot and Tabula
 """
 
+import csv
+import json
 import logging
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 import tempfile
+import uuid
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
 
 try:
     import camelot
     CAMELOT_AVAILABLE = True
+    try:
+        from camelot.handlers import PDFHandler
+    except ImportError:
+        PDFHandler = None
 except ImportError:
     CAMELOT_AVAILABLE = False
+    PDFHandler = None
 
 try:
     import tabula
@@ -21,19 +36,97 @@ except ImportError:
     TABULA_AVAILABLE = False
 
 try:
+    # tabula-py >= 2.6 runs tabula-java in a persistent JVM when jpype is installed
+    import jpype
+    JPYPE_AVAILABLE = True
+except ImportError:
+    JPYPE_AVAILABLE = False
+
+try:
+    import numpy as np
     import pandas as pd
     PANDAS_AVAILABLE = True
 except ImportError:
     PANDAS_AVAILABLE = False
-    # Create a dummy pandas for type hints
+    # Create dummy imports for type hints
+    class np:
+        class ndarray:
+            pass
     class pd:
         class DataFrame:
             pass
 
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pa_ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from ..config import ProcessingConfig
+from ._camelot_patches import patch_text_edges
+from ._table_kernels import is_header_row
+from ..utils.pdf_utils import PDFUtils, mapped_pdf
 
 logger = logging.getLogger(__name__)
 
+if CAMELOT_AVAILABLE:
+    # Stream parsing spends most of its time searching text edges
+    try:
+        from camelot.core import TextEdges
+        patch_text_edges(TextEdges)
+    except Exception as e:
+        logger.debug(f"Could not patch Camelot text edge search: {e}")
+
+
+# Extractor reused by each pool worker process
+_worker_extractor = None
+
+
+def pool_mp_context(config: ProcessingConfig):
+    """
+    Multiprocessing context for worker pools created while Tabula is enabled.
+    
+    With jpype, tabula-py runs its JVM inside the calling process, e.g. on the
+    sequential path for single-page documents, and a JVM does not survive a
+    fork. Pools are therefore spawned rather than forked whenever Tabula may run.
+    
+    Returns:
+        A spawn context, or None for the platform default
+    """
+    if (TABULA_AVAILABLE and config.table_extraction_enabled
+            and config.table_detection_method in ('tabula', 'both')):
+        return multiprocessing.get_context('spawn')
+    return None
+
+# Shared pool for overlapping the per-table file writes
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def _extract_page_tables(pdf_path: str, page_nums: List[int], config: ProcessingConfig) -> Dict[int, List[Dict]]:
+    """Process pool entry point: extract candidate tables from a chunk of pages"""
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = TableExtractor(config)
+    
+    page_tables = _worker_extractor.extract_document_tables(pdf_path, page_nums)
+    for tables in page_tables.values():
+        for table_info in tables:
+            # Parser objects aren't sent back
+            table_info.pop('camelot_table', None)
+    return page_tables
+
 
 class TableExtractor:
     """
@@ -61,13 +154,28 @@ class TableExtractor:
         if not PANDAS_AVAILABLE:
             raise ImportError("pandas is required for table processing")
         
+        if 'tabula' in self.available_methods and not JPYPE_AVAILABLE:
+            logger.info("jpype not installed; Tabula will start a new JVM for every call")
+        
         # Create tables output directory
         self.tables_dir = Path(self.config.output_dir) / "tables"
         self.tables_dir.mkdir(parents=True, exist_ok=True)
         
         self.extracted_count = 0
+        
+        # Long-format cells and manifest rows waiting for the next dataset flush
+        self.dataset_dir = self.tables_dir / "dataset"
+        self._dataset_batches = []
+        self._dataset_manifest = []
+        # File lists of the queued tables, so a failed flush can be taken out of the results
+        self._dataset_tables = []
+        
+        # Background table writes, checked by wait_for_writes()
+        self._pending_writes = []
+        if 'dataset' in self.config.table_output_formats and not PYARROW_AVAILABLE:
+            logger.warning("pyarrow not installed; the 'dataset' table output format is disabled")
     
-    def extract_tables(self, page, page_num: int, results: Dict):
+    def extract_tables(self, page, page_num: int, results: Dict, pdf_path: Optional[str] = None):
         """
         Extract tables from a PDF page.
         
@@ -75,157 +183,344 @@ class TableExtractor:
             page: PyMuPDF page object
             page_num: Page number (0-indexed)
             results: Results dictionary to update
+            pdf_path: Path to the PDF file, if the caller already knows it
+        
+        Tables queued for the 'dataset' format are written by flush_dataset(results),
+        which the caller runs once after the last page.
         """
         if not self.config.table_extraction_enabled or not self.available_methods:
             return
         
         try:
             # Get PDF file path - we need the original file for Camelot/Tabula
-            pdf_path = self._get_pdf_path_from_page(page)
+            if pdf_path is None:
+                pdf_path = self._get_pdf_path_from_page(page)
             if not pdf_path:
                 logger.warning(f"Could not determine PDF path for page {page_num}")
                 return
             
-            tables = []
-            
-            # Try different extraction methods
-            if 'camelot' in self.available_methods and self.config.table_detection_method in ['camelot', 'both']:
-                camelot_tables = self._extract_with_camelot(pdf_path, page_num)
-                tables.extend(camelot_tables)
-            
-            if 'tabula' in self.available_methods and self.config.table_detection_method in ['tabula', 'both']:
-                tabula_tables = self._extract_with_tabula(pdf_path, page_num)
-                tables.extend(tabula_tables)
-            
-            # Process and save tables
-            for table_info in tables:
-                if self._should_save_table(table_info):
-                    saved_files = self._save_table(table_info, page_num)
-                    if saved_files:
-                        table_entry = {
-                            'type': 'table',
-                            'page': page_num,
-                            'bbox': table_info.get('bbox'),
-                            'method': table_info.get('method'),
-                            'accuracy': table_info.get('accuracy'),
-                            'rows': table_info.get('rows', 0),
-                            'columns': table_info.get('columns', 0),
-                            'files': saved_files,
-                            'has_header': table_info.get('has_header', False)
-                        }
-                        results['content']['tables'].append(table_entry)
-                        results['artifacts']['tables'].extend(saved_files)
-            
-            logger.debug(f"Extracted {len(tables)} tables from page {page_num}")
+            tables = self.extract_document_tables(pdf_path, [page_num])
+            self._store_tables(tables.get(page_num, []), page_num, results)
+            self.wait_for_writes(results)
             
         except Exception as e:
             logger.error(f"Table extraction failed for page {page_num}: {e}")
     
+    def extract_tables_batch(self, pdf_path: str, page_nums: List[int], results: Dict):
+        """
+        Extract tables from several pages, spreading the pages across worker processes.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            page_nums: Page numbers (0-indexed) to process
+            results: Results dictionary to update
+        """
+        if not self.config.table_extraction_enabled or not self.available_methods or not page_nums:
+            return
+        
+        page_tables = {}
+        cpu_count = os.cpu_count() or 1
+        max_workers = min(cpu_count, self.config.max_workers or cpu_count, len(page_nums))
+        
+        # Keep the file mapped while Camelot/Tabula re-open it by path
+        with mapped_pdf(pdf_path):
+            if self.config.parallel_processing and max_workers > 1:
+                try:
+                    # One contiguous chunk of pages per worker keeps library calls batched
+                    chunk_size = -(-len(page_nums) // max_workers)
+                    chunks = [page_nums[i:i + chunk_size] for i in range(0, len(page_nums), chunk_size)]
+                    
+                    with ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=pool_mp_context(self.config)) as executor:
+                        futures = [
+                            executor.submit(_extract_page_tables, pdf_path, chunk, self.config)
+                            for chunk in chunks
+                        ]
+                        for future in as_completed(futures):
+                            page_tables.update(future.result())
+                except Exception as e:
+                    logger.warning(f"Parallel table extraction failed, continuing sequentially: {e}")
+                    page_tables = {}
+            
+            if not page_tables:
+                page_tables = self.extract_document_tables(pdf_path, page_nums)
+        
+        # Save in page order so file numbering is deterministic
+        for page_num in sorted(page_tables):
+            try:
+                self._store_tables(page_tables[page_num], page_num, results)
+            except Exception as e:
+                logger.error(f"Table extraction failed for page {page_num}: {e}")
+        
+        self.wait_for_writes(results)
+        self.flush_dataset(results)
+    
+    def extract_document_tables(self, pdf_path: str, page_nums: List[int]) -> Dict[int, List[Dict]]:
+        """
+        Run the configured extraction methods over several pages at once.
+        
+        Camelot and Tabula are each invoked once for the whole page range, so their
+        Ghostscript/JVM start-up cost is paid once rather than per page.
+        
+        Returns:
+            Candidate tables keyed by page number (0-indexed)
+        """
+        tables = {page_num: [] for page_num in page_nums}
+        
+        # Try different extraction methods
+        if 'camelot' in self.available_methods and self.config.table_detection_method in ['camelot', 'both']:
+            for page_num, camelot_tables in self._extract_with_camelot(pdf_path, page_nums).items():
+                tables.setdefault(page_num, []).extend(camelot_tables)
+        
+        if 'tabula' in self.available_methods and self.config.table_detection_method in ['tabula', 'both']:
+            # Reuse table regions Camelot already found instead of letting Tabula re-detect them
+            try:
+                hint_areas = self._camelot_areas_for_tabula(pdf_path, tables)
+            except Exception as e:
+                logger.debug(f"Could not build Tabula areas from Camelot tables: {e}")
+                hint_areas = {}
+            
+            for page_num, tabula_tables in self._extract_with_tabula(pdf_path, page_nums, hint_areas).items():
+                tables.setdefault(page_num, []).extend(tabula_tables)
+        
+        return tables
+    
+    def _store_tables(self, tables: List[Dict], page_num: int, results: Dict):
+        """Save accepted tables and record them in the results"""
+        for table_info in tables:
+            if self._should_save_table(table_info):
+                saved_files = self._save_table(table_info, page_num)
+                if saved_files:
+                    table_entry = {
+                        'type': 'table',
+                        'page': page_num,
+                        'bbox': table_info.get('bbox'),
+                        'method': table_info.get('method'),
+                        'accuracy': table_info.get('accuracy'),
+                        'rows': table_info.get('rows', 0),
+                        'columns': table_info.get('columns', 0),
+                        'files': saved_files,
+                        'has_header': table_info.get('has_header', False)
+                    }
+                    results['content']['tables'].append(table_entry)
+                    # The shared dataset directory is listed once, by flush_dataset()
+                    results['artifacts']['tables'].extend(
+                        path for path in saved_files if path != str(self.dataset_dir)
+                    )
+        
+        logger.debug(f"Extracted {len(tables)} tables from page {page_num}")
+    
     def _get_pdf_path_from_page(self, page) -> Optional[str]:
         """Get the PDF file path from a page object"""
-        try:
-            return page.parent.name
-        except:
-            return None
+        parent = getattr(page, 'parent', None)
+        return getattr(parent, 'name', None) if parent is not None else None
     
-    def _extract_with_camelot(self, pdf_path: str, page_num: int) -> List[Dict]:
-        """Extract tables using Camelot"""
-        tables = []
+    def _extract_with_camelot(self, pdf_path: str, page_nums: List[int]) -> Dict[int, List[Dict]]:
+        """Extract tables using Camelot, with one call per flavor for all pages"""
+        tables = {page_num: [] for page_num in page_nums}
         
         try:
             # Camelot uses 1-based page numbers
-            camelot_page = str(page_num + 1)
+            camelot_pages = ','.join(str(page_num + 1) for page_num in page_nums)
             
-            # Try lattice method first (better for tables with lines)
-            if self.config.camelot_flavor in ['lattice', 'both']:
-                try:
-                    lattice_tables = camelot.read_pdf(
-                        pdf_path,
-                        pages=camelot_page,
-                        flavor='lattice'
-                    )
-                    
-                    for i, table in enumerate(lattice_tables):
-                        if table.accuracy >= self.config.table_accuracy_threshold:
-                            table_info = {
-                                'method': 'camelot_lattice',
-                                'dataframe': table.df,
-                                'accuracy': table.accuracy,
-                                'bbox': self._camelot_bbox_to_list(table._bbox) if hasattr(table, '_bbox') else None,
-                                'rows': len(table.df),
-                                'columns': len(table.df.columns),
-                                'has_header': self._detect_table_header(table.df),
-                                'camelot_table': table
-                            }
-                            tables.append(table_info)
-                except Exception as e:
-                    logger.debug(f"Camelot lattice failed for page {page_num}: {e}")
+            # One handler opens the PDF and resolves the pages once for both flavors
+            handler = PDFHandler(pdf_path, pages=camelot_pages) if PDFHandler else None
+            
+            # Lattice bboxes per page, used to drop stream duplicates before table.df is built
+            lattice_bboxes: Dict[int, List[List[float]]] = {}
             
-            # Try stream method (better for tables without lines)
-            if self.config.camelot_flavor in ['stream', 'both']:
+            # Try lattice method first (better for tables with lines),
+            # then stream method (better for tables without lines)
+            for flavor in ('lattice', 'stream'):
+                if self.config.camelot_flavor not in [flavor, 'both']:
+                    continue
+                
+                flavor_tables = self._read_camelot(pdf_path, page_nums, flavor, handler)
+                
                 try:
-                    stream_tables = camelot.read_pdf(
-                        pdf_path,
-                        pages=camelot_page,
-                        flavor='stream'
-                    )
-                    
-                    for i, table in enumerate(stream_tables):
-                        if table.accuracy >= self.config.table_accuracy_threshold:
-                            table_info = {
-                                'method': 'camelot_stream',
-                                'dataframe': table.df,
-                                'accuracy': table.accuracy,
-                                'bbox': self._camelot_bbox_to_list(table._bbox) if hasattr(table, '_bbox') else None,
-                                'rows': len(table.df),
-                                'columns': len(table.df.columns),
-                                'has_header': self._detect_table_header(table.df),
-                                'camelot_table': table
-                            }
-                            tables.append(table_info)
+                    for table in flavor_tables:
+                        # Reject tables _should_save_table would discard before touching table.df
+                        if table.accuracy < self.config.table_accuracy_threshold:
+                            continue
+                        shape = getattr(table, 'shape', None)
+                        if shape and (shape[0] < 2 or shape[1] < 2):
+                            continue
+                        
+                        page_num = int(table.page) - 1
+                        bbox = self._camelot_bbox_to_list(table._bbox) if hasattr(table, '_bbox') else None
+                        if bbox is not None:
+                            if flavor == 'lattice':
+                                lattice_bboxes.setdefault(page_num, []).append(bbox)
+                            elif self._is_duplicate_bbox(bbox, lattice_bboxes.get(page_num, [])):
+                                continue
+                        
+                        tables.setdefault(page_num, []).append(
+                            self._camelot_table_info(table, f'camelot_{flavor}')
+                        )
                 except Exception as e:
-                    logger.debug(f"Camelot stream failed for page {page_num}: {e}")
+                    logger.warning(f"Camelot {flavor} failed for pages {camelot_pages}: {e}")
                     
         except Exception as e:
-            logger.warning(f"Camelot extraction failed for page {page_num}: {e}")
+            logger.warning(f"Camelot extraction failed for pages {page_nums}: {e}")
         
         return tables
     
-    def _extract_with_tabula(self, pdf_path: str, page_num: int) -> List[Dict]:
-        """Extract tables using Tabula"""
-        tables = []
+    def _read_camelot(self, pdf_path: str, page_nums: List[int], flavor: str, handler=None) -> List:
+        """
+        Parse several pages with one Camelot flavor.
+        
+        A page that makes Camelot or Ghostscript fail aborts the whole call, so on
+        failure the pages are retried one at a time and only the failing ones are lost.
+        """
+        camelot_pages = ','.join(str(page_num + 1) for page_num in page_nums)
+        try:
+            if handler is not None:
+                return list(handler.parse(flavor=flavor))
+            return list(camelot.read_pdf(pdf_path, pages=camelot_pages, flavor=flavor))
+        except Exception as e:
+            if len(page_nums) == 1:
+                logger.warning(f"Camelot {flavor} failed for page {camelot_pages}: {e}")
+                return []
+            logger.warning(f"Camelot {flavor} failed for pages {camelot_pages}, retrying page by page: {e}")
+        
+        flavor_tables = []
+        for page_num in page_nums:
+            try:
+                flavor_tables.extend(camelot.read_pdf(pdf_path, pages=str(page_num + 1), flavor=flavor))
+            except Exception as e:
+                logger.warning(f"Camelot {flavor} failed for page {page_num + 1}: {e}")
+        return flavor_tables
+    
+    def _is_duplicate_bbox(self, bbox: List[float], existing: List[List[float]]) -> bool:
+        """Check whether bbox overlaps any already-kept bbox above the dedupe threshold"""
+        if not existing:
+            return False
+        return bool(PDFUtils.pairwise_iou_np([bbox], existing).max() > self.config.table_dedupe_threshold)
+    
+    def _camelot_table_info(self, table, method: str) -> Dict:
+        """Build the table info dict for a Camelot table"""
+        return {
+            'method': method,
+            'dataframe': table.df,
+            'accuracy': table.accuracy,
+            'bbox': self._camelot_bbox_to_list(table._bbox) if hasattr(table, '_bbox') else None,
+            'rows': len(table.df),
+            'columns': len(table.df.columns),
+            'has_header': self._detect_table_header(table.df),
+            'camelot_table': table
+        }
+    
+    def _extract_with_tabula(self, pdf_path: str, page_nums: List[int],
+                             hint_areas: Optional[Dict[int, List[List[float]]]] = None) -> Dict[int, List[Dict]]:
+        """
+        Extract tables using Tabula.
+        
+        Pages with hint areas (Tabula [top, left, bottom, right] regions, e.g. from
+        Camelot) are read with detection turned off; all other pages share a single
+        JVM launch.
+        """
+        tables = {page_num: [] for page_num in page_nums}
+        hint_areas = hint_areas or {}
         
         try:
-            # Tabula uses 1-based page numbers
-            tabula_page = page_num + 1
+            # Known table regions let Tabula skip its own layout guessing
+            for page_num in page_nums:
+                if hint_areas.get(page_num):
+                    raw_tables = self._read_tabula(
+                        pdf_path, page_num + 1, area=hint_areas[page_num], guess=False, stream=True
+                    )
+                    self._add_tabula_tables(tables, raw_tables, page_num)
             
-            # Extract tables
-            dfs = tabula.read_pdf(
-                pdf_path,
-                pages=tabula_page,
-                multiple_tables=True,
-                pandas_options={'header': 'infer'}
-            )
+            remaining = [page_num for page_num in page_nums if not hint_areas.get(page_num)]
+            if not remaining:
+                return tables
             
-            for i, df in enumerate(dfs):
-                if len(df) > 0 and len(df.columns) > 1:  # Basic validation
-                    table_info = {
-                        'method': 'tabula',
-                        'dataframe': df,
-                        'accuracy': self._estimate_tabula_accuracy(df),
-                        'bbox': None,  # Tabula doesn't provide bbox info
-                        'rows': len(df),
-                        'columns': len(df.columns),
-                        'has_header': self._detect_table_header(df),
-                        'tabula_index': i
-                    }
-                    tables.append(table_info)
+            # Tabula uses 1-based page numbers; JSON output records each table's page
+            raw_tables = self._read_tabula(pdf_path, [page_num + 1 for page_num in remaining])
+            
+            if len(remaining) > 1 and any('page_number' not in raw for raw in raw_tables):
+                # Older tabula-java releases don't report pages, so fall back to one call per page
+                for page_num in remaining:
+                    self._add_tabula_tables(tables, self._read_tabula(pdf_path, page_num + 1), page_num)
+            else:
+                self._add_tabula_tables(tables, raw_tables, remaining[0])
                     
         except Exception as e:
-            logger.warning(f"Tabula extraction failed for page {page_num}: {e}")
+            logger.warning(f"Tabula extraction failed for pages {page_nums}: {e}")
         
         return tables
     
+    def _read_tabula(self, pdf_path: str, pages, **options) -> List[Dict]:
+        """Run Tabula and return its raw JSON tables"""
+        return tabula.read_pdf(
+            pdf_path,
+            pages=pages,
+            multiple_tables=True,
+            output_format='json',
+            **options
+        )
+    
+    def _add_tabula_tables(self, tables: Dict[int, List[Dict]], raw_tables: List[Dict], default_page: int):
+        """Validate raw Tabula tables and add them to the per-page table lists"""
+        for raw in raw_tables:
+            page_num = raw['page_number'] - 1 if 'page_number' in raw else default_page
+            df = self._tabula_json_to_dataframe(raw)
+            
+            # Basic validation, done before the accuracy and header scans
+            rows, columns = df.shape
+            if rows < 2 or columns < 2:
+                continue
+            accuracy = self._estimate_tabula_accuracy(df)
+            if accuracy < self.config.table_accuracy_threshold:
+                continue
+            
+            page_tables = tables.setdefault(page_num, [])
+            table_info = {
+                'method': 'tabula',
+                'dataframe': df,
+                'accuracy': accuracy,
+                'bbox': None,  # Tabula bboxes use a different origin than Camelot's
+                'rows': rows,
+                'columns': columns,
+                'has_header': self._detect_table_header(df),
+                'tabula_index': len(page_tables)
+            }
+            page_tables.append(table_info)
+    
+    def _camelot_areas_for_tabula(self, pdf_path: str, page_tables: Dict[int, List[Dict]]) -> Dict[int, List[List[float]]]:
+        """Convert Camelot bboxes (bottom-left origin) into Tabula areas (top-left origin)"""
+        if not fitz:
+            return {}
+        
+        areas = {}
+        with fitz.open(pdf_path) as document:
+            for page_num, tables in page_tables.items():
+                bboxes = [t['bbox'] for t in tables if t.get('bbox')]
+                if not bboxes:
+                    continue
+                
+                page_height = document[page_num].rect.height
+                areas[page_num] = [
+                    [page_height - y2, x1, page_height - y1, x2]
+                    for x1, y1, x2, y2 in bboxes
+                ]
+        return areas
+    
+    
+    def _tabula_json_to_dataframe(self, raw_table: Dict) -> pd.DataFrame:
+        """
+        Convert a Tabula JSON table to a DataFrame, using the first row as header.
+        
+        Mirrors tabula-py's own JSON conversion for read_pdf DataFrames: empty cells
+        become NaN and empty header cells become "".
+        """
+        rows = [[cell.get('text') or np.nan for cell in row] for row in raw_table.get('data', [])]
+        if not rows:
+            return pd.DataFrame()
+        
+        header = ["" if name is np.nan else name for name in rows[0]]
+        return pd.DataFrame(rows[1:], columns=header)
+    
     def _camelot_bbox_to_list(self, bbox) -> Optional[List[float]]:
         """Convert Camelot bbox to list format"""
         try:
@@ -242,46 +537,43 @@ class TableExtractor:
         if len(df) == 0:
             return False
         
-        # Check if first row looks like headers
+        # Check if first row looks like headers: typically strings, different from data below
         first_row = df.iloc[0]
-        
-        # Headers are typically strings and different from data below
-        first_row_str_count = sum(1 for x in first_row if isinstance(x, str) and len(str(x).strip()) > 0)
-        
-        if first_row_str_count > len(df.columns) * 0.7:  # 70% of columns have string values
-            return True
+        first_row_is_str = first_row.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+        first_row_lengths = first_row.astype(str).str.strip().str.len().to_numpy(dtype=np.int64)
         
         # Check if column names look meaningful
-        meaningful_names = sum(1 for col in df.columns 
-                              if isinstance(col, str) and len(col.strip()) > 2 and not col.startswith('Unnamed'))
-        
-        if meaningful_names > len(df.columns) * 0.5:  # 50% of columns have meaningful names
-            return True
-        
-        return False
+        columns = pd.Series(df.columns)
+        names = columns.astype(str)
+        name_is_str = columns.map(lambda name: isinstance(name, str)).to_numpy(dtype=bool)
+        name_lengths = names.str.strip().str.len().to_numpy(dtype=np.int64)
+        unnamed_mask = names.str.startswith('Unnamed').to_numpy(dtype=bool)
+        
+        return bool(is_header_row(
+            np.where(first_row_is_str, first_row_lengths, 0),
+            np.where(name_is_str, name_lengths, 0),
+            unnamed_mask
+        ))
     
     def _estimate_tabula_accuracy(self, df: pd.DataFrame) -> float:
         """Estimate accuracy for Tabula tables (which don't provide this metric)"""
         if len(df) == 0:
             return 0.0
         
-        # Simple heuristic based on data quality
-        total_cells = len(df) * len(df.columns)
-        non_empty_cells = 0
-        
-        for _, row in df.iterrows():
-            for value in row:
-                if pd.notna(value) and str(value).strip():
-                    non_empty_cells += 1
+        # Simple heuristic based on data quality:
+        # a cell counts as filled when it is not NA and not blank once stripped
+        not_blank = df.astype(str).apply(lambda column: column.str.strip().ne(''))
+        filled_mask = (df.notna() & not_blank).to_numpy(dtype=bool)
         
         # Base accuracy on fill rate
-        fill_rate = non_empty_cells / total_cells if total_cells > 0 else 0
+        rate = float(filled_mask.mean()) if filled_mask.size else 0.0
         
         # Boost accuracy if table has reasonable structure
         if len(df) >= 2 and len(df.columns) >= 2:
-            fill_rate += 0.1
+            rate += 0.1
         
-        return min(100.0, fill_rate * 100)
+        return min(100.0, rate * 100)
+    
     
     def _should_save_table(self, table_info: Dict) -> bool:
         """Determine if a table should be saved"""
@@ -299,7 +591,13 @@ class TableExtractor:
         return True
     
     def _save_table(self, table_info: Dict, page_num: int) -> List[str]:
-        """Save a table in multiple formats"""
+        """
+        Save a table in multiple formats.
+        
+        The writes run on the I/O pool and are not waited for here, so the next table
+        can be prepared while this one is written. The returned list is the files being
+        written; wait_for_writes() drops any that fail.
+        """
         saved_files = []
         
         try:
@@ -309,56 +607,218 @@ class TableExtractor:
             
             self.extracted_count += 1
             method = table_info.get('method', 'unknown')
-            base_filename = f"page_{page_num:03d}_table_{self.extracted_count:03d}_{method}"
+            # Build the path prefix once; method names contain no dots, so with_suffix is safe
+            prefix = self.tables_dir / f"page_{page_num:03d}_table_{self.extracted_count:03d}_{method}"
             
-            # Save as CSV
-            csv_path = self.tables_dir / f"{base_filename}.csv"
-            df.to_csv(csv_path, index=False)
-            saved_files.append(str(csv_path))
+            csv_path = prefix.with_suffix('.csv')
+            excel_path = prefix.with_suffix('.xlsx')
+            json_path = prefix.with_suffix('.json')
+            parquet_path = prefix.with_suffix('.parquet')
+            metadata_path = prefix.with_name(prefix.name + '_metadata.json')
             
-            # Save as Excel
-            try:
-                excel_path = self.tables_dir / f"{base_filename}.xlsx"
-                df.to_excel(excel_path, index=False)
-                saved_files.append(str(excel_path))
-            except Exception as e:
-                logger.debug(f"Could not save Excel file: {e}")
+            metadata = {
+                'method': table_info.get('method'),
+                'accuracy': table_info.get('accuracy'),
+                'bbox': table_info.get('bbox'),
+                'rows': table_info.get('rows'),
+                'columns': table_info.get('columns'),
+                'has_header': table_info.get('has_header'),
+                'page': page_num
+            }
             
-            # Save as JSON
-            try:
-                json_path = self.tables_dir / f"{base_filename}.json"
-                df.to_json(json_path, orient='records', indent=2)
-                saved_files.append(str(json_path))
-            except Exception as e:
-                logger.debug(f"Could not save JSON file: {e}")
+            # The output files are independent, so write them concurrently in the background
+            formats = self.config.table_output_formats
+            writes = []
+            if 'csv' in formats:
+                if method.startswith('camelot') and df.size > self.config.table_stream_threshold:
+                    csv_write = _IO_POOL.submit(self._write_csv_streaming, csv_path, df)
+                else:
+                    csv_write = _IO_POOL.submit(df.to_csv, csv_path, index=False)
+                writes.append((csv_path, csv_write))
+            if 'xlsx' in formats:
+                writes.append((excel_path, _IO_POOL.submit(df.to_excel, excel_path, index=False)))
+            if 'json' in formats:
+                writes.append((json_path, _IO_POOL.submit(self._write_records_json, json_path, df)))
+            if 'parquet' in formats:
+                writes.append((parquet_path, _IO_POOL.submit(self._write_parquet, parquet_path, df)))
+            if 'dataset' in formats and PYARROW_AVAILABLE:
+                # Cells and metadata go to the per-document dataset and manifest instead
+                self._queue_dataset_table(df, metadata, self.extracted_count)
+                saved_files.append(str(self.dataset_dir))
+                self._dataset_tables.append(saved_files)
+            else:
+                writes.append((metadata_path, _IO_POOL.submit(self._write_metadata, metadata_path, metadata)))
             
-            # Save metadata
-            try:
-                metadata = {
-                    'method': table_info.get('method'),
-                    'accuracy': table_info.get('accuracy'),
-                    'bbox': table_info.get('bbox'),
-                    'rows': table_info.get('rows'),
-                    'columns': table_info.get('columns'),
-                    'has_header': table_info.get('has_header'),
-                    'page': page_num
-                }
-                
-                metadata_path = self.tables_dir / f"{base_filename}_metadata.json"
-                import json
-                with open(metadata_path, 'w') as f:
-                    json.dump(metadata, f, indent=2)
-                saved_files.append(str(metadata_path))
-            except Exception as e:
-                logger.debug(f"Could not save metadata: {e}")
+            saved_files.extend(str(path) for path, _ in writes)
+            self._pending_writes.append((saved_files, csv_path, writes))
             
-            logger.debug(f"Saved table files: {saved_files}")
+            logger.debug(f"Saving table files: {saved_files}")
             return saved_files
             
         except Exception as e:
             logger.error(f"Failed to save table: {e}")
             return []
     
+    def wait_for_writes(self, results: Dict):
+        """
+        Wait for the background table writes and drop failed files from the results.
+        
+        A table whose CSV could not be written is removed from the results entirely,
+        matching the behaviour of a failed synchronous save.
+        """
+        pending, self._pending_writes = self._pending_writes, []
+        if not pending:
+            return
+        
+        wait([future for _, _, writes in pending for _, future in writes])
+        
+        failed_files = set()
+        failed_tables = []
+        for saved_files, csv_path, writes in pending:
+            for path, future in writes:
+                try:
+                    future.result()
+                except Exception as e:
+                    if path == csv_path:
+                        logger.error(f"Failed to save table: {e}")
+                        failed_tables.append(saved_files)
+                        failed_files.update(saved_files)
+                    else:
+                        logger.debug(f"Could not save {path.name}: {e}")
+                        failed_files.add(str(path))
+                        if str(path) in saved_files:
+                            saved_files.remove(str(path))
+        
+        if not failed_files:
+            return
+        
+        failed_ids = {id(files) for files in failed_tables}
+        results['content']['tables'] = [
+            table for table in results['content']['tables']
+            if id(table.get('files')) not in failed_ids
+        ]
+        results['artifacts']['tables'] = [
+            path for path in results['artifacts']['tables'] if path not in failed_files
+        ]
+    
+    def _write_csv_streaming(self, csv_path: Path, df: pd.DataFrame):
+        """Write a large Camelot table row by row; its cells are all strings, so the bytes match df.to_csv"""
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')  # df.to_csv line endings
+            writer.writerow(df.columns)  # Same header line df.to_csv writes
+            writer.writerows(df.to_numpy().tolist())
+    
+    def _write_records_json(self, json_path: Path, df: pd.DataFrame):
+        """Write table rows as a JSON list of records"""
+        if ORJSON_AVAILABLE:
+            records = df.to_dict(orient='records')
+            json_path.write_bytes(orjson.dumps(
+                records, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            ))
+        else:
+            df.to_json(json_path, orient='records', indent=2)
+    
+    def _write_parquet(self, parquet_path: Path, df: pd.DataFrame):
+        """Write a table as zstd-compressed Parquet"""
+        # Parquet needs string column names and uniformly typed object columns
+        df = df.rename(columns=str)
+        df = df.astype({column: str for column in df.select_dtypes('object').columns})
+        df.to_parquet(parquet_path, engine='pyarrow', compression='zstd', index=False)
+    
+    def _write_metadata(self, metadata_path: Path, metadata: Dict):
+        """Write table metadata as JSON"""
+        if ORJSON_AVAILABLE:
+            metadata_path.write_bytes(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
+        else:
+            with open(metadata_path, 'w') as f:
+                json.dump(metadata, f, indent=2)
+    
+    def _queue_dataset_table(self, df: pd.DataFrame, metadata: Dict, table_id: int):
+        """Queue a table's cells in long format (one row per cell) for the dataset"""
+        values = df.astype(str).where(df.notna(), '').to_numpy(dtype=object)
+        n_rows, n_columns = values.shape
+        n_cells = n_rows * n_columns
+        
+        self._dataset_batches.append(pa.table({
+            # Plain names: dataset discovery skips paths starting with '_', e.g. '__page__=3'
+            'page': np.full(n_cells, metadata['page'], dtype=np.int32),
+            'table_id': np.full(n_cells, table_id, dtype=np.int32),
+            'row': np.repeat(np.arange(n_rows, dtype=np.int32), n_columns),
+            'column': np.tile(np.asarray([str(c) for c in df.columns], dtype=object), n_rows),
+            'value': values.ravel(),
+        }))
+        self._dataset_manifest.append({**metadata, 'table_id': table_id})
+    
+    def flush_dataset(self, results: Optional[Dict] = None) -> Optional[str]:
+        """
+        Write queued tables to the consolidated Parquet dataset.
+        
+        Cells are appended under tables/dataset, partitioned by page, and each
+        table's metadata is appended to tables/manifest.jsonl. The whole
+        dataset can be read back with pyarrow.dataset.dataset(path, partitioning='hive').
+        
+        Args:
+            results: Results dictionary to update. On success the dataset directory is
+                added to the table artifacts; on failure it is removed from the queued
+                tables' files, and tables left with no files are dropped.
+        
+        Returns:
+            Dataset directory if anything was written, otherwise None
+        """
+        if not self._dataset_batches:
+            return None
+        
+        batches, self._dataset_batches = self._dataset_batches, []
+        manifest, self._dataset_manifest = self._dataset_manifest, []
+        queued_tables, self._dataset_tables = self._dataset_tables, []
+        dataset_path = str(self.dataset_dir)
+        
+        try:
+            pa_ds.write_dataset(
+                pa.concat_tables(batches),
+                base_dir=str(self.dataset_dir),
+                format='parquet',
+                partitioning=['page'],
+                partitioning_flavor='hive',
+                # A unique part name per flush so later flushes never replace earlier files
+                basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior='overwrite_or_ignore'
+            )
+            self._append_manifest(manifest)
+        except Exception as e:
+            logger.error(f"Failed to write table dataset: {e}")
+            if results is not None:
+                for saved_files in queued_tables:
+                    if dataset_path in saved_files:
+                        saved_files.remove(dataset_path)
+                results['content']['tables'] = [
+                    table for table in results['content']['tables'] if table.get('files')
+                ]
+            return None
+        
+        if results is not None and dataset_path not in results['artifacts']['tables']:
+            results['artifacts']['tables'].append(dataset_path)
+        
+        logger.debug(f"Wrote {len(manifest)} tables to {self.dataset_dir}")
+        return dataset_path
+    
+    def _append_manifest(self, entries: List[Dict]):
+        """Append metadata rows to the dataset manifest, locking it against other processes"""
+        if ORJSON_AVAILABLE:
+            payload = b''.join(orjson.dumps(entry) + b'\n' for entry in entries)
+        else:
+            payload = ''.join(json.dumps(entry) + '\n' for entry in entries).encode('utf-8')
+        
+        # Kept beside the dataset directory so dataset readers only see Parquet files
+        with open(self.tables_dir / "manifest.jsonl", 'ab') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(payload)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+    
     def merge_overlapping_tables(self, tables: List[Dict], overlap_threshold: float = 0.5) -> List[Dict]:
         """Merge tables that overlap significantly (e.g., detected by multiple methods)"""
         if not tables:
@@ -371,23 +831,21 @@ class TableExtractor:
         if not tables_with_bbox:
             return tables  # Can't merge without position information
         
+        # Pairwise overlap for all tables at once
+        bboxes = np.asarray([t['bbox'] for t in tables_with_bbox], dtype=np.float64)
+        overlaps = PDFUtils.pairwise_iou_np(bboxes, bboxes) > overlap_threshold
+        
         merged = []
-        used = set()
+        used = np.zeros(len(tables_with_bbox), dtype=bool)
         
-        for i, table1 in enumerate(tables_with_bbox):
-            if i in used:
+        for i in range(len(tables_with_bbox)):
+            if used[i]:
                 continue
             
-            current_group = [table1]
-            used.add(i)
-            
-            for j, table2 in enumerate(tables_with_bbox[i+1:], i+1):
-                if j in used:
-                    continue
-                
-                if self._calculate_table_overlap(table1['bbox'], table2['bbox']) > overlap_threshold:
-                    current_group.append(table2)
-                    used.add(j)
+            used[i] = True
+            group = np.flatnonzero(overlaps[i] & ~used)
+            used[group] = True
+            current_group = [tables_with_bbox[i]] + [tables_with_bbox[j] for j in group]
             
             # Choose best table from group (highest accuracy)
             best_table = max(current_group, key=lambda t: t.get('accuracy', 0))
@@ -397,20 +855,3 @@ class TableExtractor:
         merged.extend(tables_without_bbox)
         
         return merged
-    
-    def _calculate_table_overlap(self, bbox1: List[float], bbox2: List[float]) -> float:
-        """Calculate overlap ratio between two table bounding boxes"""
-        x1_1, y1_1, x2_1, y2_1 = bbox1
-        x1_2, y1_2, x2_2, y2_2 = bbox2
-        
-        # Calculate intersection
-        x_overlap = max(0, min(x2_1, x2_2) - max(x1_1, x1_2))
-        y_overlap = max(0, min(y2_1, y2_2) - max(y1_1, y1_2))
-        intersection = x_overlap * y_overlap
-        
-        # Calculate union
-        area1 = (x2_1 - x1_1) * (y2_1 - y1_1)
-        area2 = (x2_2 - x1_2) * (y2_2 - y1_2)
-        union = area1 + area2 - intersection
-        
-        return intersection / union if union > 0 else 0
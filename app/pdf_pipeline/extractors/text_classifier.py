@@ -4,8 +4,9 @@ Text classification for different content types in PDF documents
 
 import logging
 import re
+import string
 from typing import List, Dict, Optional, Tuple, Set
-import statistics
+import numpy as np
 
 try:
     import fitz  # PyMuPDF
@@ -13,9 +14,48 @@ except ImportError:
     fitz = None
 
 from ..config import ProcessingConfig
+from ._pattern_set import PatternSet
+from ._text_kernels import (
+    FEATURE_BOLD, FEATURE_LAYOUT_CAPTION, FEATURE_LAYOUT_TITLE, FEATURE_SHORT, FEATURE_TITLE_WORD,
+    NUMBA_AVAILABLE, find_region, label_lines, warm_up
+)
 
 logger = logging.getLogger(__name__)
 
+# Bits reported by the classification pattern set, in pattern order
+_PAGE_NUMBER = 1 << 0
+_FOOTNOTE = 1 << 1
+_CITATION = 1 << 2
+_CAPTION = 1 << 3
+_LIST_ITEM = (1 << 4) | (1 << 5) | (1 << 6) | (1 << 7)
+
+# Turns ASCII punctuation into spaces so "Introduction:" splits to "introduction"
+_PUNCTUATION_TO_SPACE = str.maketrans(string.punctuation, ' ' * len(string.punctuation))
+
+# Text type for each label_lines code
+_LINE_TYPES = ('body', 'page_number', 'header', 'footer', 'footnote', 'caption', 'list', 'title')
+
+# Results content list for each text type
+_CONTENT_KEYS = {
+    'title': 'titles',
+    'header': 'headers',
+    'footer': 'footers',
+    'page_number': 'page_numbers',
+    'footnote': 'footnotes',
+    'list': 'lists',
+    'caption': 'captions',
+    'body': 'text_blocks',
+}
+
+# Initial capacity of the document font size buffer
+_FONT_SIZE_CAPACITY = 4096
+
+# Page height assumed in post-processing, where the real page size is no longer known
+_APPROX_PAGE_HEIGHT = 800.0
+
+# Distinct span styles kept for sharing before the cache is reset
+_SPAN_STYLE_CACHE_LIMIT = 4096
+
 
 class TextClassifier:
     """
@@ -40,51 +80,73 @@ class TextClassifier:
         # Compile regex patterns for efficiency
         self._compile_patterns()
         
-        # Track document statistics for adaptive thresholds
-        self.font_sizes = []
-        self.median_font_size = None
+        # Default "dict" extraction flags minus image blocks, which are skipped anyway
+        dict_flags = getattr(fitz, 'TEXTFLAGS_DICT', None)
+        preserve_images = getattr(fitz, 'TEXT_PRESERVE_IMAGES', 0)
+        self.text_flags = dict_flags & ~preserve_images if dict_flags is not None else None
         
-    def _compile_patterns(self):
-        """Compile regex patterns for text classification"""
-        # Page number patterns
-        self.page_number_pattern = re.compile(
-            r'^\s*(?:page\s*)?(\d+|[ivxlcdm]+)\s*$',
-            re.IGNORECASE
-        )
+        # Track document statistics for adaptive thresholds; font_sizes is a buffer
+        # grown geometrically, of which the first font_size_count entries are used
+        self.font_sizes = np.empty(_FONT_SIZE_CAPACITY, dtype=np.float64)
+        self.font_size_count = 0
+        self.median_font_size = None
         
-        # Footnote patterns
-        self.footnote_pattern = re.compile(
-            r'^\s*[\d\*†‡§¶#]+\s*[\.:\-\s]',
-            re.IGNORECASE
-        )
+        # Layout regions as box tuples and an (N, 4) array, rebuilt when a new region list arrives
+        self._regions_source = None
+        self._region_boxes = []
+        self._region_bboxes = np.empty((0, 4), dtype=np.float64)
+        self._region_types = []
+        warm_up()
         
-        # Citation patterns
-        self.citation_pattern = re.compile(
-            r'\[\d+\]|\(\d{4}\)|et\s+al\.|ibid\.|op\.\s*cit\.',
-            re.IGNORECASE
-        )
+        # Span style dicts by (size, flags, font, color); lines in the same style
+        # share one dict in their font_info instead of each holding a copy
+        self._span_styles = {}
         
-        # List patterns
-        self.list_patterns = [
-            re.compile(r'^\s*[\d\w]\.\s+'),  # 1. numbered
-            re.compile(r'^\s*[a-z]\)\s+'),   # a) lettered
-            re.compile(r'^\s*[•·‣▪▫▸▹◦‧⁃]\s+'),  # bullet points
-            re.compile(r'^\s*[-\*\+]\s+'),   # dash/asterisk bullets
-        ]
+        # Region thresholds in points, set per page by _set_page_height
+        self._set_page_height(_APPROX_PAGE_HEIGHT)
         
+    def _compile_patterns(self):
+        """Compile the classification patterns into one set scanned once per line"""
         # Title patterns
         self.title_indicators = [
             'abstract', 'introduction', 'conclusion', 'discussion',
             'methodology', 'results', 'references', 'bibliography',
             'acknowledgments', 'appendix', 'chapter', 'section'
         ]
-        
-        # Caption patterns
-        caption_keywords = '|'.join(self.config.caption_keywords)
-        self.caption_pattern = re.compile(
-            rf'^\s*(?:{caption_keywords})\s*[:\d\.]',
-            re.IGNORECASE
+        # Matched as whole words, so e.g. "resultsfrom" or "sectional" do not count
+        self._title_indicator_set = frozenset(self.title_indicators)
+        
+        # Caption patterns: keywords are literal text, and longest-first ordering lets
+        # "figure" win over its prefix "fig" in the alternation
+        caption_keywords = '|'.join(
+            re.escape(keyword)
+            for keyword in sorted(self.config.caption_keywords, key=len, reverse=True)
         )
+        
+        # (pattern, ignore_case) in bit order, then the keyword groups;
+        # see the module-level bit constants. The numbered and lettered list
+        # patterns are case-sensitive
+        self._pattern_set = PatternSet([
+            # Page number
+            (r'^\s*(?:page\s*)?(\d+|[ivxlcdm]+)\s*$', True),
+            # Footnote marker
+            (r'^\s*[\d\*†‡§¶#]+\s*[\.:\-\s]', True),
+            # Citation
+            (r'\[\d+\]|\(\d{4}\)|et\s+al\.|ibid\.|op\.\s*cit\.', True),
+            # Caption
+            (rf'^\s*(?:{caption_keywords})\s*[:\d\.]', True),
+            # List items
+            (r'^\s*[\d\w]\.\s+', False),  # 1. numbered
+            (r'^\s*[a-z]\)\s+', False),   # a) lettered
+            (r'^\s*[•·‣▪▫▸▹◦‧⁃]\s+', False),  # bullet points
+            (r'^\s*[-\*\+]\s+', False),   # dash/asterisk bullets
+        ], keyword_groups=[
+            self.config.caption_keywords,
+        ], prefilters={
+            # The caption regex can only match lines containing a caption keyword
+            3: 0,
+        })
+        logger.debug(f"Text classification patterns use the {self._pattern_set.backend} backend")
     
     def classify_text_blocks(self, page, page_num: int, layout_regions: List[Dict], results: Dict):
         """
@@ -97,265 +159,301 @@ class TextClassifier:
             results: Results dictionary to update
         """
         try:
-            # Get page text with detailed formatting info
-            text_dict = page.get_text("dict")
-            page_rect = page.rect
-            
-            # Collect font size statistics for adaptive thresholds
-            self._collect_font_statistics(text_dict)
-            
-            # Process text blocks
-            for block in text_dict.get("blocks", []):
-                if block.get("type", 0) == 1:  # Skip image blocks
-                    continue
-                
-                self._process_text_block(block, page_num, page_rect, layout_regions, results)
-            
+            page_lines = self.read_page_lines(page, page_num, layout_regions)
         except Exception as e:
             logger.error(f"Text classification failed for page {page_num}: {e}")
-    
-    def _collect_font_statistics(self, text_dict: Dict):
-        """Collect font size statistics for adaptive classification"""
-        for block in text_dict.get("blocks", []):
-            if block.get("type", 0) == 1:
-                continue
-            
-            for line in block.get("lines", []):
-                for span in line.get("spans", []):
-                    font_size = span.get("size", 0)
-                    if font_size > 0:
-                        self.font_sizes.append(font_size)
-        
-        # Update median font size
-        if self.font_sizes:
-            self.median_font_size = statistics.median(self.font_sizes)
-    
-    def _process_text_block(self, block: Dict, page_num: int, page_rect, layout_regions: List[Dict], results: Dict):
-        """Process a single text block"""
-        block_bbox = block.get("bbox")
-        if not block_bbox:
             return
         
-        # Get layout region type if available
-        layout_type = self._get_layout_type(block_bbox, layout_regions)
-        
-        # Process each line in the block
-        for line in block.get("lines", []):
-            self._process_text_line(line, page_num, page_rect, layout_type, results)
+        self.store_page_lines(page_num, page_lines, results)
     
-    def _process_text_line(self, line: Dict, page_num: int, page_rect, layout_type: Optional[str], results: Dict):
-        """Process a single text line"""
-        line_bbox = line.get("bbox")
-        if not line_bbox:
-            return
-        
-        # Combine all spans in the line
-        text_parts = []
-        font_info = []
-        
-        for span in line.get("spans", []):
-            text = span.get("text", "").strip()
-            if text:
-                text_parts.append(text)
-                font_info.append({
-                    'size': span.get("size", 0),
-                    'flags': span.get("flags", 0),
-                    'font': span.get("font", ""),
-                    'color': span.get("color", 0)
-                })
-        
-        if not text_parts:
-            return
+    def get_page_text(self, page) -> Dict:
+        """Get page text with detailed formatting info, leaving image blocks out"""
+        return page.get_text("dict", flags=self.text_flags)
+    
+    def read_page_lines(self, page, page_num: int, layout_regions: List[Dict],
+                        text_dict: Optional[Dict] = None) -> Tuple:
+        """
+        Read a page's lines without touching document-wide state.
         
-        full_text = " ".join(text_parts)
+        Args:
+            page: PyMuPDF page object
+            page_num: Page number (0-indexed)
+            layout_regions: Layout detection results
+            text_dict: The page's get_page_text() result, if already extracted
         
-        # Classify the text line
-        text_type = self._classify_text_line(
-            full_text, line_bbox, page_rect, page_num, font_info, layout_type
-        )
+        Returns:
+            (page_height, entries, line_data, sizes) for store_page_lines
+        """
+        if text_dict is None:
+            text_dict = self.get_page_text(page)
         
-        # Create text entry
-        text_entry = {
-            'type': text_type,
-            'text': full_text,
-            'page': page_num,
-            'bbox': list(line_bbox),
-            'font_info': font_info,
-            'layout_type': layout_type
-        }
+        # Region lookups for this page's blocks
+        self._set_layout_regions(layout_regions)
         
-        # Add to appropriate category
-        if text_type == 'title':
-            results['content']['titles'].append(text_entry)
-        elif text_type == 'header':
-            results['content']['headers'].append(text_entry)
-        elif text_type == 'footer':
-            results['content']['footers'].append(text_entry)
-        elif text_type == 'page_number':
-            results['content']['page_numbers'].append(text_entry)
-        elif text_type == 'footnote':
-            results['content']['footnotes'].append(text_entry)
-        elif text_type == 'list':
-            results['content']['lists'].append(text_entry)
-        elif text_type == 'caption':
-            results['content']['captions'].append(text_entry)
-        else:  # body text
-            results['content']['text_blocks'].append(text_entry)
+        # Gather the page's lines and font sizes in one walk
+        entries, line_data, sizes = self._collect_page_lines(text_dict, page_num, layout_regions)
+        return page.rect.height, entries, line_data, sizes
     
-    def _classify_text_line(self, text: str, bbox: Tuple, page_rect, page_num: int, 
-                           font_info: List[Dict], layout_type: Optional[str]) -> str:
-        """Classify a single text line"""
-        
-        # Quick filters
-        if len(text.strip()) == 0:
-            return 'body'
+    def store_page_lines(self, page_num: int, page_lines: Tuple, results: Dict):
+        """Update the font statistics with a read page, classify its lines and store them"""
+        page_height, entries, line_data, sizes = page_lines
+        
+        # Entries are gathered per page and added to the results with one extend per type
+        page_results = {'content': {key: [] for key in _CONTENT_KEYS.values()}}
+        appenders = {
+            text_type: page_results['content'][key].append
+            for text_type, key in _CONTENT_KEYS.items()
+        }
         
-        # Check page number
-        if self._is_page_number(text, bbox, page_rect):
-            return 'page_number'
+        try:
+            self._set_page_height(page_height)
+            
+            # Update font size statistics for adaptive thresholds before classifying
+            self._collect_font_statistics(sizes)
+            
+            if entries:
+                for entry, text_type in zip(entries, self._classify_page_lines(entries, line_data)):
+                    entry['type'] = text_type
+                    appenders[text_type](entry)
+            
+        except Exception as e:
+            logger.error(f"Text classification failed for page {page_num}: {e}")
         
-        # Check header/footer by position
-        if self._is_header_footer(bbox, page_rect):
-            return 'header' if bbox[1] < page_rect.height * self.config.header_region_threshold else 'footer'
+        for key, page_entries in page_results['content'].items():
+            if page_entries:
+                results['content'][key].extend(page_entries)
+    
+    def _set_page_height(self, height: float):
+        """Precompute the y coordinates bounding the header, footer and footnote regions"""
+        self._page_height = float(height)
+        self._header_y = self._page_height * self.config.header_region_threshold
+        self._footer_y = self._page_height * self.config.footer_region_threshold
+        self._footnote_y = self._page_height * 0.7  # Footnotes are typically in bottom 30% of page
+    
+    def _collect_font_statistics(self, sizes: List[float]):
+        """Add a page's span font sizes to the document statistics"""
+        if sizes:
+            start = self.font_size_count
+            end = start + len(sizes)
+            if end > self.font_sizes.shape[0]:
+                grown = np.empty(max(end, 2 * self.font_sizes.shape[0]), dtype=np.float64)
+                grown[:start] = self.font_sizes[:start]
+                self.font_sizes = grown
+            self.font_sizes[start:end] = sizes
+            self.font_size_count = end
+        
+        # Update median font size (O(n) selection rather than a full sort)
+        if self.font_size_count:
+            self.median_font_size = self._median(self.font_sizes[:self.font_size_count])
+    
+    @staticmethod
+    def _median(values: np.ndarray) -> float:
+        """Median via np.partition, averaging the middle pair for even counts"""
+        n = values.shape[0]
+        k = n // 2
+        if n % 2:
+            return float(np.partition(values, k)[k])
+        middle = np.partition(values, [k - 1, k])
+        return float((middle[k - 1] + middle[k]) / 2)
+    
+    def _collect_page_lines(self, text_dict: Dict, page_num: int,
+                            layout_regions: List[Dict]) -> Tuple[List[Dict], Dict[str, np.ndarray], List[float]]:
+        """
+        Build the text entry for every non-empty line on a page.
         
-        # Check footnote
-        if self._is_footnote(text, bbox, page_rect, font_info):
-            return 'footnote'
+        Returns:
+            The entries (without 'type'), per-line arrays used for classification
+            ('bboxes' (N, 4), 'avg_sizes', 'bold', 'matches' (pattern bitmask) and
+            'title_word'),
+            and the positive font size of every span for the document statistics
+        """
+        entries = []
+        sizes = []
+        span_styles = self._span_styles
+        bboxes = []
+        avg_sizes = []
+        bold = []
+        matches = []
+        title_word = []
         
-        # Check caption
-        if self._is_caption(text, layout_type):
-            return 'caption'
+        for block in text_dict.get("blocks", []):
+            if block.get("type", 0) == 1:  # Skip image blocks
+                continue
+            
+            block_bbox = block.get("bbox")
+            if not block_bbox:
+                # Such blocks still count towards the font statistics
+                sizes.extend(
+                    span.get("size", 0)
+                    for line in block.get("lines", [])
+                    for span in line.get("spans", [])
+                    if span.get("size", 0) > 0
+                )
+                continue
+            
+            # Get layout region type if available
+            layout_type = self._get_layout_type(block_bbox, layout_regions)
+            
+            for line in block.get("lines", []):
+                spans = line.get("spans", [])
+                sizes.extend(span.get("size", 0) for span in spans if span.get("size", 0) > 0)
+                
+                line_bbox = line.get("bbox")
+                if not line_bbox:
+                    continue
+                
+                # Combine all spans in the line
+                text_parts = []
+                font_info = []
+                size_total = 0
+                line_bold = False
+                
+                for span in spans:
+                    text = span.get("text", "").strip()
+                    if text:
+                        text_parts.append(text)
+                        size = span.get("size", 0)
+                        flags = span.get("flags", 0)
+                        size_total += size
+                        line_bold = line_bold or bool(flags & 2**4)  # Bold flag
+                        font = span.get("font", "")
+                        color = span.get("color", 0)
+                        style = span_styles.get((size, flags, font, color))
+                        if style is None:
+                            if len(span_styles) >= _SPAN_STYLE_CACHE_LIMIT:
+                                span_styles.clear()
+                            style = span_styles[(size, flags, font, color)] = {
+                                'size': size,
+                                'flags': flags,
+                                'font': font,
+                                'color': color
+                            }
+                        font_info.append(style)
+                
+                if not text_parts:
+                    continue
+                
+                full_text = " ".join(text_parts)
+                
+                entries.append({
+                    'type': None,
+                    'text': full_text,
+                    'page': page_num,
+                    # PyMuPDF bboxes are already tuples; avoid a list copy per line
+                    'bbox': line_bbox if isinstance(line_bbox, tuple) else tuple(line_bbox),
+                    'font_info': font_info,
+                    'layout_type': layout_type
+                })
+                bboxes.append(line_bbox)
+                avg_sizes.append(size_total / len(font_info))
+                bold.append(line_bold)
+                # One scan per line reports every pattern that matches it
+                matches.append(self._pattern_set.scan(full_text))
+                title_word.append(self._has_title_indicator(full_text.casefold()))
+        
+        n_lines = len(entries)
+        line_data = {
+            'bboxes': np.asarray(bboxes, dtype=np.float64).reshape(n_lines, 4),
+            'avg_sizes': np.asarray(avg_sizes, dtype=np.float64),
+            'bold': np.asarray(bold, dtype=bool),
+            'matches': np.asarray(matches, dtype=np.int64),
+            'title_word': np.asarray(title_word, dtype=bool),
+        }
+        return entries, line_data, sizes
+    
+    def _classify_page_lines(self, entries: List[Dict], line_data: Dict[str, np.ndarray]) -> List[str]:
+        """
+        Classify a page's lines together.
         
-        # Check list item
-        if self._is_list_item(text):
-            return 'list'
+        Per-line features are packed into arrays and label_lines applies the rules;
+        the first matching rule in priority order decides the type.
+        """
+        n_lines = len(entries)
+        layout_types = [(entry['layout_type'] or '').lower() for entry in entries]
+        features = np.fromiter(
+            (
+                (FEATURE_SHORT if len(entry['text']) <= 10 else 0)
+                | (FEATURE_LAYOUT_CAPTION if 'caption' in lt else 0)
+                | (FEATURE_LAYOUT_TITLE if lt == 'title' else 0)
+                for entry, lt in zip(entries, layout_types)
+            ),
+            dtype=np.int64, count=n_lines
+        )
+        features[line_data['bold']] |= FEATURE_BOLD
+        features[line_data['title_word']] |= FEATURE_TITLE_WORD
+        
+        # Size rules only apply once a median font size is known
+        if self.median_font_size:
+            footnote_size_max = self.median_font_size * self.config.footnote_size_ratio
+            title_size_min = self.median_font_size * self.config.title_size_ratio
+        else:
+            footnote_size_max = title_size_min = np.inf
+        
+        codes = label_lines(
+            line_data['bboxes'][:, 1], line_data['bboxes'][:, 3], line_data['avg_sizes'],
+            features, line_data['matches'],
+            np.array([_PAGE_NUMBER, _FOOTNOTE | _CITATION, _CAPTION, _LIST_ITEM], dtype=np.int64),
+            np.array([self._header_y, self._footer_y, self._footnote_y,
+                      footnote_size_max, title_size_min], dtype=np.float64)
+        )
+        labels = [_LINE_TYPES[code] for code in codes.tolist()]
         
-        # Check title/heading
-        if self._is_title(text, font_info, layout_type):
-            return 'title'
+        # Short lines that are all caps might be headings; only body lines need the check
+        for i, label in enumerate(labels):
+            if label == 'body' and self._is_upper_heading(entries[i]['text']):
+                labels[i] = 'title'
         
-        return 'body'
+        return labels
     
     def _get_layout_type(self, bbox: Tuple, layout_regions: List[Dict]) -> Optional[str]:
         """Get layout type for a bounding box"""
+        if layout_regions is not self._regions_source:
+            self._set_layout_regions(layout_regions)
+        
+        if not self._region_types:
+            return None
+        
         x0, y0, x1, y1 = bbox
         center_x = (x0 + x1) / 2
         center_y = (y0 + y1) / 2
         
-        for region in layout_regions:
-            region_bbox = region.get('bbox')
-            if region_bbox:
-                rx0, ry0, rx1, ry1 = region_bbox
-                if rx0 <= center_x <= rx1 and ry0 <= center_y <= ry1:
-                    return region.get('type')
+        if NUMBA_AVAILABLE:
+            index = find_region(center_x, center_y, self._region_bboxes)
+            return self._region_types[index] if index >= 0 else None
         
+        # Uncompiled, indexing the array costs more than looping over plain tuples
+        for (rx0, ry0, rx1, ry1), region_type in zip(self._region_boxes, self._region_types):
+            if rx0 <= center_x <= rx1 and ry0 <= center_y <= ry1:
+                return region_type
         return None
     
-    def _is_page_number(self, text: str, bbox: Tuple, page_rect) -> bool:
-        """Check if text is a page number"""
-        # Must be short
-        if len(text.strip()) > 10:
-            return False
-        
-        # Must match page number pattern
-        if not self.page_number_pattern.match(text):
-            return False
-        
-        # Must be in header/footer region
-        y_ratio = bbox[1] / page_rect.height
-        if not (y_ratio < self.config.header_region_threshold or 
-                y_ratio > self.config.footer_region_threshold):
-            return False
-        
-        return True
+    def _set_layout_regions(self, layout_regions: List[Dict]):
+        """Convert a page's layout regions for _get_layout_type"""
+        regions = [region for region in layout_regions if region.get('bbox')]
+        self._regions_source = layout_regions
+        self._region_boxes = [tuple(region['bbox'][:4]) for region in regions]
+        self._region_bboxes = np.asarray(self._region_boxes, dtype=np.float64).reshape(-1, 4)
+        self._region_types = [region.get('type') for region in regions]
     
-    def _is_header_footer(self, bbox: Tuple, page_rect) -> bool:
-        """Check if text is in header or footer region"""
-        y_ratio = bbox[1] / page_rect.height
-        return (y_ratio < self.config.header_region_threshold or 
-                y_ratio > self.config.footer_region_threshold)
+    def _has_title_indicator(self, folded: str) -> bool:
+        """Check if any word of the case-folded text is a section-name title indicator"""
+        words = folded.translate(_PUNCTUATION_TO_SPACE).split()
+        return not self._title_indicator_set.isdisjoint(words)
     
-    def _is_footnote(self, text: str, bbox: Tuple, page_rect, font_info: List[Dict]) -> bool:
-        """Check if text is a footnote"""
-        # Must be in footer region
-        y_ratio = bbox[3] / page_rect.height  # Use bottom of bbox
-        if y_ratio < 0.7:  # Footnotes are typically in bottom 30% of page
-            return False
-        
-        # Check font size (footnotes are typically smaller)
-        if font_info and self.median_font_size:
-            avg_size = sum(f.get('size', 0) for f in font_info) / len(font_info)
-            if avg_size > self.median_font_size * self.config.footnote_size_ratio:
-                return False
-        
-        # Check for footnote markers
-        if self.footnote_pattern.match(text):
-            return True
-        
-        # Check for citation patterns
-        if self.citation_pattern.search(text):
-            return True
-        
-        return False
-    
-    def _is_caption(self, text: str, layout_type: Optional[str]) -> bool:
-        """Check if text is a caption"""
-        # Layout detector might identify it as a caption
-        if layout_type and 'caption' in layout_type.lower():
-            return True
-        
-        # Check for caption patterns
-        if self.caption_pattern.match(text):
-            return True
-        
-        return False
-    
-    def _is_list_item(self, text: str) -> bool:
-        """Check if text is a list item"""
-        for pattern in self.list_patterns:
-            if pattern.match(text):
-                return True
-        return False
-    
-    def _is_title(self, text: str, font_info: List[Dict], layout_type: Optional[str]) -> bool:
-        """Check if text is a title or heading"""
-        # Layout detector might identify it as a title
-        if layout_type and layout_type.lower() == 'title':
-            return True
-        
-        # Check font size (titles are typically larger)
-        if font_info and self.median_font_size:
-            avg_size = sum(f.get('size', 0) for f in font_info) / len(font_info)
-            if avg_size >= self.median_font_size * self.config.title_size_ratio:
-                return True
-        
-        # Check for title indicators
-        text_lower = text.lower()
-        for indicator in self.title_indicators:
-            if indicator in text_lower:
-                return True
-        
-        # Check font flags (bold, italic)
-        if font_info:
-            for f in font_info:
-                flags = f.get('flags', 0)
-                if flags & 2**4:  # Bold flag
-                    return True
-        
-        # Short lines that are all caps might be headings
-        if len(text) < 100 and text.isupper() and len(text.split()) <= 10:
-            return True
-        
-        return False
+    def _is_upper_heading(self, text: str) -> bool:
+        """Check if text is a short all-caps line that might be a heading"""
+        return len(text) < 100 and text.isupper() and len(text.split()) <= 10
     
     def post_process_classification(self, results: Dict):
         """Post-process classification results to fix common errors"""
         try:
-            # Merge nearby text blocks of the same type
-            self._merge_nearby_blocks(results)
+            # Merge nearby text blocks of the same type; the same walk groups the
+            # merged body text for the header/footer fix
+            text_groups = {}
+            self._merge_nearby_blocks(results, text_groups)
             
             # Fix misclassified headers/footers
-            self._fix_header_footer_classification(results)
+            self._fix_header_footer_classification(results, text_groups)
             
             # Establish reading order
             self._establish_reading_order(results)
@@ -363,26 +461,38 @@ class TextClassifier:
         except Exception as e:
             logger.error(f"Post-processing failed: {e}")
     
-    def _merge_nearby_blocks(self, results: Dict):
-        """Merge text blocks that are very close together"""
+    def _merge_nearby_blocks(self, results: Dict, text_groups: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Merge text blocks that are very close together.
+        
+        If text_groups is given, the resulting body text blocks are also added to it
+        by stripped text, as _fix_header_footer_classification expects.
+        """
+        # Config is fixed for the document; read it once rather than per block pair
+        merge_threshold = self.config.text_merge_threshold
+        
         for content_type in ['text_blocks', 'titles', 'captions']:
+            groups = text_groups if content_type == 'text_blocks' else None
             blocks = results['content'].get(content_type, [])
             if len(blocks) <= 1:
+                if groups is not None:
+                    self._group_by_text(blocks, groups)
                 continue
             
             # Sort by page and position
             blocks.sort(key=lambda x: (x['page'], x['bbox'][1]))
             
             merged = []
+            n_blocks = len(blocks)
             i = 0
-            while i < len(blocks):
+            while i < n_blocks:
                 current = blocks[i]
                 
                 # Look for blocks to merge with current
                 merge_group = [current]
                 j = i + 1
                 
-                while j < len(blocks):
+                while j < n_blocks:
                     next_block = blocks[j]
                     
                     # Must be on same page
@@ -391,7 +501,7 @@ class TextClassifier:
                     
                     # Must be close vertically
                     vertical_gap = next_block['bbox'][1] - current['bbox'][3]
-                    if vertical_gap > self.config.text_merge_threshold:
+                    if vertical_gap > merge_threshold:
                         break
                     
                     # Must have similar horizontal alignment
@@ -406,10 +516,12 @@ class TextClassifier:
                 
                 # Merge the group
                 if len(merge_group) == 1:
-                    merged.append(merge_group[0])
+                    merged_block = merge_group[0]
                 else:
                     merged_block = self._merge_text_group(merge_group)
-                    merged.append(merged_block)
+                merged.append(merged_block)
+                if groups is not None:
+                    self._group_by_text((merged_block,), groups)
                 
                 i = j
             
@@ -430,21 +542,14 @@ class TextClassifier:
         # Use properties from first block
         merged = blocks[0].copy()
         merged['text'] = combined_text
-        merged['bbox'] = [min_x, min_y, max_x, max_y]
+        merged['bbox'] = (min_x, min_y, max_x, max_y)
         merged['merged_from'] = len(blocks)
         
         return merged
     
-    def _fix_header_footer_classification(self, results: Dict):
-        """Fix common header/footer misclassifications"""
-        # Look for repeated text that should be headers/footers
-        all_text_blocks = []
-        for content_type in ['text_blocks', 'headers', 'footers']:
-            all_text_blocks.extend(results['content'].get(content_type, []))
-        
-        # Group by text content
-        text_groups = {}
-        for block in all_text_blocks:
+    def _group_by_text(self, blocks, text_groups: Dict[str, List[Dict]]):
+        """Add blocks to text_groups keyed by stripped text, skipping very short text"""
+        for block in blocks:
             text = block['text'].strip()
             if len(text) < 5:  # Skip very short text
                 continue
@@ -452,13 +557,37 @@ class TextClassifier:
             if text not in text_groups:
                 text_groups[text] = []
             text_groups[text].append(block)
+    
+    def _fix_header_footer_classification(self, results: Dict,
+                                          text_groups: Optional[Dict[str, List[Dict]]] = None):
+        """
+        Fix common header/footer misclassifications.
+        
+        Args:
+            results: Results dictionary to update
+            text_groups: Body text blocks already grouped by _merge_nearby_blocks;
+                grouped here from scratch if not given
+        """
+        # Look for repeated text that should be headers/footers. Group by text
+        # content; each block's text is stripped exactly once, while grouping
+        if text_groups is None:
+            text_groups = {}
+            self._group_by_text(results['content'].get('text_blocks', []), text_groups)
+        for content_type in ['headers', 'footers']:
+            self._group_by_text(results['content'].get(content_type, []), text_groups)
+        
+        # Header/footer bounds on an approximate page
+        header_y = _APPROX_PAGE_HEIGHT * self.config.header_region_threshold
+        footer_y = _APPROX_PAGE_HEIGHT * self.config.footer_region_threshold
         
         # Find repeated text (appears on multiple pages)
+        moved = {'headers': [], 'footers': []}
+        moved_ids = set()
         for text, blocks in text_groups.items():
             if len(blocks) >= 3:  # Appears on at least 3 pages
                 # Check if all instances are in header/footer regions
                 in_header_footer = all(
-                    self._is_header_footer(block['bbox'], {'height': 800})  # Approximate page height
+                    block['bbox'][1] < header_y or block['bbox'][1] > footer_y
                     for block in blocks
                 )
                 
@@ -467,17 +596,25 @@ class TextClassifier:
                     avg_y = sum(block['bbox'][1] for block in blocks) / len(blocks)
                     target_type = 'headers' if avg_y < 100 else 'footers'
                     
-                    # Remove from current locations
-                    for content_type in ['text_blocks', 'headers', 'footers']:
-                        results['content'][content_type] = [
-                            block for block in results['content'].get(content_type, [])
-                            if block['text'].strip() != text
-                        ]
-                    
-                    # Add to target type
                     for block in blocks:
                         block['type'] = target_type[:-1]  # Remove 's'
-                        results['content'][target_type].append(block)
+                    moved[target_type].extend(blocks)
+                    moved_ids.update(id(block) for block in blocks)
+        
+        if not moved_ids:
+            return
+        
+        # Remove moved blocks from their current locations in one pass per list;
+        # the groups hold every block with that text, so identity is enough
+        for content_type in ['text_blocks', 'headers', 'footers']:
+            results['content'][content_type] = [
+                block for block in results['content'].get(content_type, [])
+                if id(block) not in moved_ids
+            ]
+        
+        # Add to target types
+        results['content']['headers'].extend(moved['headers'])
+        results['content']['footers'].extend(moved['footers'])
     
     def _establish_reading_order(self, results: Dict):
         """Establish reading order for text blocks"""
@@ -486,9 +623,11 @@ class TextClassifier:
         
         # Sort all text content by page and position
         for content_type in results['content'].values():
-            if isinstance(content_type, list):
-                content_type.sort(key=lambda x: (
-                    x.get('page', 0),
-                    x.get('bbox', [0, 0, 0, 0])[1],  # Y position
-                    x.get('bbox', [0, 0, 0, 0])[0]   # X position
-                ))
+            if isinstance(content_type, list) and len(content_type) > 1:
+                # Build the (page, y, x) keys in one pass, then sort indices by them
+                keys = []
+                for x in content_type:
+                    bbox = x.get('bbox') or (0, 0, 0, 0)
+                    keys.append((x.get('page', 0), bbox[1], bbox[0]))
+                order = sorted(range(len(content_type)), key=keys.__getitem__)
+                content_type[:] = [content_type[i] for i in order]
@@ -8,8 +8,11 @@ using multiple specialized extractors and analysis techniques.
 import os
 import json
 import logging
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 from dataclasses import asdict
 import time
 
@@ -18,20 +21,167 @@ try:
 except ImportError:
     fitz = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import ProcessingConfig
 from .extractors.layout_detector import LayoutDetector
 from .extractors.image_extractor import ImageExtractor
-from .extractors.table_extractor import TableExtractor
+from .extractors.table_extractor import TableExtractor, pool_mp_context
 from .extractors.text_classifier import TextClassifier
 from .extractors.formula_detector import FormulaDetector
 from .extractors.caption_matcher import CaptionMatcher
 from .extractors.ocr_processor import OCRProcessor
 from .utils.output_manager import OutputManager
-from .utils.pdf_utils import PDFUtils
+from .utils.page_bundle import PageBundle
+from .utils.pdf_utils import PDFUtils, mapped_pdf
 
 
 logger = logging.getLogger(__name__)
 
+# Position used for content without a bbox when sorting
+_ZERO_BBOX = (0.0, 0.0, 0.0, 0.0)
+
+# Extractor classes by name; extractors are created on first use
+_EXTRACTOR_CLASSES = {
+    'layout_detector': LayoutDetector,
+    'image_extractor': ImageExtractor,
+    'table_extractor': TableExtractor,
+    'text_classifier': TextClassifier,
+    'formula_detector': FormulaDetector,
+    'caption_matcher': CaptionMatcher,
+    'ocr_processor': OCRProcessor,
+}
+
+# Extractors run on each page by _analyze_page
+_PAGE_EXTRACTORS = ('layout_detector', 'image_extractor', 'formula_detector', 'text_classifier')
+
+# Default page analysis workers; each one loads its own layout model
+_DEFAULT_PAGE_WORKERS = 4
+
+# Extractors used by page analysis workers, created once per worker process
+_worker_extractors = None
+
+# Processor used by batch workers, created once per worker process
+_worker_processor = None
+
+
+def _snapshot(value: Any) -> Any:
+    """Copy the dicts and lists of a results structure, sharing the leaf values"""
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_snapshot(item) for item in value]
+    return value
+
+
+def _safe_run(errors: List[Tuple[int, str, str]], step: str, page_num: int, func, *args, default=None):
+    """
+    Call func(*args), recording a failure in errors instead of logging it.
+    
+    Per-page failures are logged together once all pages are done; see
+    PDFProcessor._report_page_errors.
+    
+    Returns:
+        The result of func, or default if it raised
+    """
+    try:
+        return func(*args)
+    except Exception as e:
+        errors.append((page_num, step, str(e)))
+        return default
+
+
+def _analyze_page(extractors: Dict[str, Any], page, page_num: int, errors: List[Tuple[int, str, str]]) -> Tuple:
+    """
+    Detect a page's layout regions and find its images, formulas and text lines.
+    
+    Nothing is saved or added to the results here, so pages can be analyzed in
+    worker processes; see PDFProcessor._store_page_analysis. Failures are
+    recorded in errors.
+    
+    Returns:
+        The image candidates, validated formulas and read text lines (None if
+        unavailable) of the page
+    """
+    layout_regions = []
+    if extractors.get('layout_detector'):
+        layout_regions = _safe_run(
+            errors, "Layout detection", page_num,
+            extractors['layout_detector'].detect_layout, page, page_num, default=[]
+        )
+    
+    # Extractors share the page's PyMuPDF extractions. Formula detection skips
+    # image blocks, so it can use the classifier's text dict without them
+    text_classifier = extractors.get('text_classifier')
+    bundle = PageBundle(page, text_classifier.text_flags if text_classifier else None)
+    
+    images = []
+    if extractors.get('image_extractor'):
+        images = _safe_run(
+            errors, "Image extraction", page_num,
+            extractors['image_extractor'].find_images, page, page_num, bundle, default=[]
+        )
+    
+    text_dict = None
+    if text_classifier or extractors.get('formula_detector'):
+        text_dict = _safe_run(errors, "Text extraction", page_num, getattr, bundle, 'text_dict')
+    
+    formulas = []
+    if extractors.get('formula_detector') and text_dict is not None:
+        formulas = _safe_run(
+            errors, "Formula detection", page_num,
+            extractors['formula_detector'].find_formulas, page, page_num, text_dict, default=[]
+        )
+    
+    page_lines = None
+    if text_classifier and text_dict is not None:
+        page_lines = _safe_run(
+            errors, "Text classification", page_num,
+            text_classifier.read_page_lines, page, page_num, layout_regions, text_dict
+        )
+    
+    return images, formulas, page_lines
+
+
+def _analyze_page_block(pdf_path: str, start: int, end: int,
+                        config: ProcessingConfig) -> Tuple[Dict[int, Tuple], List[Tuple[int, str, str]]]:
+    """Pool worker: analyze pages start to end (exclusive) of one document, with their failures"""
+    global _worker_extractors
+    if _worker_extractors is None:
+        _worker_extractors = {}
+        for name in _PAGE_EXTRACTORS:
+            try:
+                _worker_extractors[name] = _EXTRACTOR_CLASSES[name](config)
+            except Exception as e:
+                logger.warning(f"Could not initialize {name} in worker: {e}")
+                _worker_extractors[name] = None
+    
+    page_analysis = {}
+    errors = []
+    document = fitz.open(pdf_path)
+    try:
+        for page_num in range(start, end):
+            page_analysis[page_num] = _analyze_page(_worker_extractors, document[page_num], page_num, errors)
+    finally:
+        document.close()
+    return page_analysis, errors
+
+
+def _process_batch_document(pdf_path: str, output_dir: Optional[str], config: ProcessingConfig) -> Dict[str, Any]:
+    """Pool worker: process one PDF of a batch, including its output files"""
+    global _worker_processor
+    if _worker_processor is None:
+        # Documents run in parallel, so each one is processed on a single core
+        _worker_processor = PDFProcessor(config.replace(parallel_processing=False))
+    
+    results = _worker_processor.process_pdf(pdf_path, output_dir)
+    _worker_processor.wait_for_outputs()
+    return results
+
 
 class PDFProcessor:
     """
@@ -52,9 +202,12 @@ class PDFProcessor:
         self.config = config or ProcessingConfig()
         self._setup_logging()
         
-        # Initialize extractors with graceful degradation
+        # The config recorded in each document's metadata; converted once per processor
+        self._config_dict = asdict(self.config)
+        
+        # Extractors are created on first use (see _get_extractor), so models a
+        # document does not need, e.g. OCR for born-digital PDFs, are never loaded
         self.extractors = {}
-        self._initialize_extractors()
         
         # Initialize utilities
         self.output_manager = OutputManager(self.config)
@@ -64,6 +217,15 @@ class PDFProcessor:
         self.document = None
         self.results = {}
         
+        # Output files are written on a background thread, one document at a time
+        self._output_pool = None
+        self.output_future: Optional[Future] = None
+        
+        # Worker processes for page analysis and process_batch, kept (with their
+        # loaded models) across documents and batches
+        self._page_pool = None
+        self._batch_pool = None
+        
     def _setup_logging(self):
         """Setup logging based on configuration"""
         level = logging.DEBUG if self.config.debug else (
@@ -74,21 +236,11 @@ class PDFProcessor:
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
         
-    def _initialize_extractors(self):
-        """Initialize all extractors with graceful degradation"""
-        extractor_classes = [
-            ('layout_detector', LayoutDetector),
-            ('image_extractor', ImageExtractor),
-            ('table_extractor', TableExtractor),
-            ('text_classifier', TextClassifier),
-            ('formula_detector', FormulaDetector),
-            ('caption_matcher', CaptionMatcher),
-            ('ocr_processor', OCRProcessor),
-        ]
-        
-        for name, extractor_class in extractor_classes:
+    def _get_extractor(self, name: str):
+        """Return the named extractor, initializing it on first use (None if unavailable)"""
+        if name not in self.extractors:
             try:
-                self.extractors[name] = extractor_class(self.config)
+                self.extractors[name] = _EXTRACTOR_CLASSES[name](self.config)
                 logger.info(f"Initialized {name}")
             except ImportError as e:
                 logger.warning(f"Could not initialize {name}: {e}")
@@ -96,197 +248,314 @@ class PDFProcessor:
             except Exception as e:
                 logger.error(f"Error initializing {name}: {e}")
                 self.extractors[name] = None
+        return self.extractors[name]
     
-    def process_pdf(self, pdf_path: str, output_dir: Optional[str] = None) -> Dict[str, Any]:
+    def process_pdf(self, pdf: Union[str, Path, bytes, Any], output_dir: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a PDF file and extract all content types.
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf: Path to the PDF file, the PDF's bytes, or an open PyMuPDF document
+                (which is left open)
             output_dir: Optional output directory (overrides config)
             
         Returns:
-            Dictionary containing all extracted content and metadata
+            Dictionary containing all extracted content and metadata. Output files
+            are written in the background; see wait_for_outputs.
         """
         if not fitz:
             raise ImportError("PyMuPDF is required but not available")
-            
-        pdf_path = Path(pdf_path)
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
-        # Setup output directory
-        if output_dir:
-            original_output_dir = self.config.output_dir
-            self.config.output_dir = output_dir
-            self.output_manager = OutputManager(self.config)
+        if isinstance(pdf, fitz.Document):
+            return self.process_document(pdf, output_dir=output_dir)
         
+        resources = ExitStack()
         try:
-            logger.info(f"Starting PDF processing: {pdf_path}")
-            start_time = time.time()
-            
-            # Open PDF document
-            self.document = fitz.open(str(pdf_path))
-            logger.info(f"Opened PDF with {self.document.page_count} pages")
-            
-            # Initialize results structure
-            self.results = {
-                'metadata': {
-                    'source_file': str(pdf_path),
-                    'total_pages': self.document.page_count,
-                    'processing_time': 0,
-                    'timestamp': time.time(),
-                    'config': asdict(self.config)
-                },
-                'content': {
-                    'text_blocks': [],
-                    'titles': [],
-                    'tables': [],
-                    'figures': [],
-                    'images': [],
-                    'formulas': [],
-                    'captions': [],
-                    'headers': [],
-                    'footers': [],
-                    'page_numbers': [],
-                    'footnotes': [],
-                    'lists': []
-                },
-                'artifacts': {
-                    'images': [],
-                    'tables': [],
-                    'text_file': None
-                }
-            }
-            
-            # Check if OCR is needed
-            text_extractable = self._check_text_extractability()
-            if text_extractable < self.config.ocr_fallback_threshold:
-                logger.info(f"Low text extractability ({text_extractable:.1%}), using OCR")
-                self._process_with_ocr()
+            if isinstance(pdf, (bytes, bytearray, memoryview)):
+                # Without a path, pages are analyzed in this process and tables are skipped
+                document = fitz.open(stream=bytes(pdf), filetype="pdf")
+                source_name = "<bytes>"
             else:
-                self._process_with_text_extraction()
-            
-            # Post-processing steps
-            self._match_captions()
-            self._classify_reading_order()
-            self._generate_outputs()
-            
-            # Finalize results
-            self.results['metadata']['processing_time'] = time.time() - start_time
-            logger.info(f"PDF processing completed in {self.results['metadata']['processing_time']:.2f}s")
-            
-            return self.results
+                pdf_path = Path(pdf)
+                if not pdf_path.exists():
+                    raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+                
+                # Keep the file mapped and read ahead while it is processed. PyMuPDF
+                # copies stream-opened documents into memory and leaves them without a
+                # path for the workers to reopen, so the document is still opened by path
+                resources.enter_context(mapped_pdf(str(pdf_path), sequential=True))
+                document = fitz.open(str(pdf_path))
+                source_name = str(pdf_path)
+            resources.callback(document.close)
             
+            return self.process_document(document, source_name, output_dir)
         finally:
-            if self.document:
-                self.document.close()
+            resources.close()
+    
+    def process_document(self, document, source_name: Optional[str] = None,
+                         output_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract all content types from an open PyMuPDF document.
+        
+        The document is not closed. Pages are analyzed in worker processes, and
+        tables extracted, only if the document was opened from a file.
+        
+        Args:
+            document: Open PyMuPDF document
+            source_name: Name recorded as the source file (the document's name if None)
+            output_dir: Optional output directory (overrides config)
             
-            # Restore original output directory if changed
-            if output_dir:
-                self.config.output_dir = original_output_dir
-                self.output_manager = OutputManager(self.config)
+        Returns:
+            Dictionary containing all extracted content and metadata. Output files
+            are written in the background; see wait_for_outputs.
+        """
+        if source_name is None:
+            source_name = document.name or "<document>"
+        
+        # Output files go to the override directory without changing the shared config
+        if output_dir:
+            output_config = self.config.replace(output_dir=output_dir)
+            output_manager = OutputManager(output_config)
+        else:
+            output_config = self.config
+            output_manager = self.output_manager
+        
+        logger.info(f"Starting PDF processing: {source_name}")
+        start_time = time.time()
+        
+        self.document = document
+        logger.info(f"Opened PDF with {self.document.page_count} pages")
+        
+        # Initialize results structure
+        self.results = {
+            'metadata': {
+                'source_file': source_name,
+                'total_pages': self.document.page_count,
+                'processing_time': 0,
+                'timestamp': time.time(),
+                'config': dict(self._config_dict, output_dir=output_config.output_dir)
+            },
+            'content': {
+                'text_blocks': [],
+                'titles': [],
+                'tables': [],
+                'figures': [],
+                'images': [],
+                'formulas': [],
+                'captions': [],
+                'headers': [],
+                'footers': [],
+                'page_numbers': [],
+                'footnotes': [],
+                'lists': []
+            },
+            'artifacts': {
+                'images': [],
+                'tables': [],
+                'text_file': None
+            }
+        }
+        
+        # Check if OCR is needed
+        text_extractable = self._check_text_extractability(self.config.ocr_fallback_threshold)
+        if text_extractable < self.config.ocr_fallback_threshold:
+            logger.info(f"Low text extractability ({text_extractable:.1%}), using OCR")
+            self._process_with_ocr()
+        else:
+            self._process_with_text_extraction()
+        
+        # Post-processing steps
+        self._match_captions()
+        self._classify_reading_order()
+        
+        # Finalize results
+        self.results['metadata']['processing_time'] = time.time() - start_time
+        logger.info(f"PDF processing completed in {self.results['metadata']['processing_time']:.2f}s")
+        
+        # Write output files while the caller moves on; the writer gets its own copy,
+        # so the caller may change the returned results straight away
+        if self._output_pool is None:
+            self._output_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-outputs')
+        self.output_future = self._output_pool.submit(
+            self._generate_outputs, output_manager, _snapshot(self.results)
+        )
+        
+        return self.results
     
-    def _check_text_extractability(self) -> float:
-        """Check what percentage of pages have extractable text"""
+    def _check_text_extractability(self, threshold: Optional[float] = None) -> float:
+        """
+        Check what percentage of pages have extractable text.
+        
+        Args:
+            threshold: If given, sampling stops as soon as the result is known to be
+                at least or below it; the returned fraction is then on the same side
+                of the threshold as the full sample's, not necessarily equal to it
+        """
         if not self.document:
             return 0.0
-            
+        
+        sample_size = min(10, self.document.page_count)  # Sample first 10 pages
+        if not sample_size:
+            return 0.0
+        
         pages_with_text = 0
-        for page_num in range(min(10, self.document.page_count)):  # Sample first 10 pages
+        for pages_checked, page_num in enumerate(range(sample_size), 1):
             page = self.document[page_num]
             text = page.get_text().strip()
             if len(text) > 50:  # Arbitrary threshold for meaningful text
                 pages_with_text += 1
+            
+            if threshold is not None and pages_checked < sample_size:
+                if pages_with_text / sample_size >= threshold:
+                    break
+                # Best case for the rest of the sample is still below the threshold
+                best_case = (pages_with_text + sample_size - pages_checked) / sample_size
+                if best_case < threshold:
+                    return best_case
         
-        return pages_with_text / min(10, self.document.page_count)
+        return pages_with_text / sample_size
     
     def _process_with_text_extraction(self):
         """Process PDF using native text extraction"""
         logger.info("Processing with native text extraction")
         
-        for page_num in range(self.document.page_count):
-            page = self.document[page_num]
-            logger.debug(f"Processing page {page_num + 1}")
-            
-            # Layout detection
-            layout_regions = self._detect_layout(page, page_num)
-            
-            # Extract different content types
-            self._extract_text_blocks(page, page_num, layout_regions)
-            self._extract_images(page, page_num)
-            self._extract_tables(page, page_num)
-            self._detect_formulas(page, page_num)
+        # Layout detection, image/formula extraction and text classification
+        self._analyze_pages(self.document.page_count)
+        
+        # Tables are extracted for all pages at once so they can run in parallel
+        self._extract_tables(list(range(self.document.page_count)))
     
     def _process_with_ocr(self):
         """Process PDF using OCR"""
-        if not self.extractors['ocr_processor']:
+        ocr_processor = self._get_extractor('ocr_processor')
+        if not ocr_processor:
             logger.error("OCR processor not available")
             return
             
         logger.info("Processing with OCR")
-        self.extractors['ocr_processor'].process_document(self.document, self.results)
+        ocr_processor.process_document(self.document, self.results)
     
-    def _detect_layout(self, page, page_num: int) -> List[Dict]:
-        """Detect page layout regions"""
-        if not self.extractors['layout_detector']:
-            return []
+    def _analyze_pages(self, page_count: int):
+        """
+        Detect layout, extract images and formulas and classify text, analyzing
+        pages in worker processes.
         
-        try:
-            return self.extractors['layout_detector'].detect_layout(page, page_num)
-        except Exception as e:
-            logger.warning(f"Layout detection failed for page {page_num}: {e}")
-            return []
+        Pages are sent to workers in contiguous blocks. A worker opens the PDF once
+        per block and creates its extractors (and loads their models) once, and the
+        workers are kept across documents, so the layout model is loaded once per
+        worker and not in this process. Images and formulas are then saved, and
+        text lines classified, in page order, so file numbering, image deduplication
+        and font statistics match processing the pages one by one.
+        """
+        page_analysis = None
+        errors = []
+        pdf_path = self.document.name
+        cpu_count = os.cpu_count() or 1
+        pool_workers = min(cpu_count, self.config.max_workers or _DEFAULT_PAGE_WORKERS)
+        max_workers = min(pool_workers, page_count)
+        
+        if self.config.parallel_processing and max_workers > 1 and pdf_path and os.path.isfile(pdf_path):
+            try:
+                # About two blocks per worker, so a slow block does not leave the
+                # other workers idle at the end
+                block_size = max(1, page_count // (max_workers * 2))
+                
+                if self._page_pool is None:
+                    self._page_pool = ProcessPoolExecutor(
+                        max_workers=pool_workers, mp_context=pool_mp_context(self.config)
+                    )
+                
+                page_analysis = {}
+                futures = [
+                    self._page_pool.submit(
+                        _analyze_page_block, pdf_path, start, min(start + block_size, page_count),
+                        self.config
+                    )
+                    for start in range(0, page_count, block_size)
+                ]
+                for future in as_completed(futures):
+                    block_analysis, block_errors = future.result()
+                    page_analysis.update(block_analysis)
+                    errors.extend(block_errors)
+            except Exception as e:
+                logger.warning(f"Parallel page analysis failed, continuing sequentially: {e}")
+                page_analysis = None
+                errors = []
+                # A worker may have died; start a fresh pool for the next document
+                if self._page_pool is not None:
+                    self._page_pool.shutdown(wait=False, cancel_futures=True)
+                    self._page_pool = None
+        
+        if page_analysis is None:
+            page_extractors = {name: self._get_extractor(name) for name in _PAGE_EXTRACTORS}
+        
+        for page_num in range(page_count):
+            if page_analysis is None:
+                logger.debug("Processing page %d", page_num + 1)
+                analysis = _analyze_page(page_extractors, self.document[page_num], page_num, errors)
+            else:
+                analysis = page_analysis[page_num]
+            self._store_page_analysis(page_num, analysis, errors)
+        
+        self._report_page_errors(errors)
     
-    def _extract_text_blocks(self, page, page_num: int, layout_regions: List[Dict]):
-        """Extract and classify text blocks"""
-        if not self.extractors['text_classifier']:
-            return
+    def _store_page_analysis(self, page_num: int, analysis: Tuple, errors: List[Tuple[int, str, str]]):
+        """Save a page's images and formulas and classify its text lines into the results"""
+        images, formulas, page_lines = analysis
         
-        try:
-            self.extractors['text_classifier'].classify_text_blocks(
-                page, page_num, layout_regions, self.results
-            )
-        except Exception as e:
-            logger.warning(f"Text classification failed for page {page_num}: {e}")
+        image_extractor = self._get_extractor('image_extractor')
+        if image_extractor:
+            _safe_run(errors, "Image extraction", page_num,
+                      image_extractor.save_images, images, page_num, self.results)
+        
+        formula_detector = self._get_extractor('formula_detector')
+        if formula_detector:
+            _safe_run(errors, "Formula detection", page_num,
+                      formula_detector.save_formulas, formulas, page_num, self.results)
+        
+        text_classifier = self._get_extractor('text_classifier')
+        if text_classifier and page_lines is not None:
+            _safe_run(errors, "Text classification", page_num,
+                      text_classifier.store_page_lines, page_num, page_lines, self.results)
     
-    def _extract_images(self, page, page_num: int):
-        """Extract images from the page"""
-        if not self.extractors['image_extractor']:
-            return
+    def _report_page_errors(self, errors: List[Tuple[int, str, str]]):
+        """Log per-page failures as one warning per failed step, with details at debug level"""
+        failures_by_step = {}
+        for page_num, step, message in sorted(errors):
+            failures_by_step.setdefault(step, []).append((page_num, message))
         
-        try:
-            self.extractors['image_extractor'].extract_images(page, page_num, self.results)
-        except Exception as e:
-            logger.warning(f"Image extraction failed for page {page_num}: {e}")
+        for step, failures in failures_by_step.items():
+            pages = ', '.join(str(page_num) for page_num, _ in failures)
+            logger.warning(f"{step} failed for {len(failures)} page(s) ({pages}): {failures[0][1]}")
+            for page_num, message in failures[1:]:
+                logger.debug("%s failed for page %d: %s", step, page_num, message)
     
-    def _extract_tables(self, page, page_num: int):
-        """Extract tables from the page"""
-        if not self.extractors['table_extractor']:
+    def _extract_tables(self, page_nums: List[int]):
+        """Extract tables from the given pages"""
+        table_extractor = self._get_extractor('table_extractor')
+        if not table_extractor:
             return
         
-        try:
-            self.extractors['table_extractor'].extract_tables(page, page_num, self.results)
-        except Exception as e:
-            logger.warning(f"Table extraction failed for page {page_num}: {e}")
-    
-    def _detect_formulas(self, page, page_num: int):
-        """Detect mathematical formulas"""
-        if not self.extractors['formula_detector']:
+        # Camelot and Tabula read the PDF from disk
+        if not self.document.name or not os.path.isfile(self.document.name):
+            logger.warning("Table extraction needs a PDF file, skipping for a document opened from memory")
             return
         
         try:
-            self.extractors['formula_detector'].detect_formulas(page, page_num, self.results)
+            table_extractor.extract_tables_batch(
+                self.document.name, page_nums, self.results
+            )
         except Exception as e:
-            logger.warning(f"Formula detection failed for page {page_num}: {e}")
+            logger.warning(f"Table extraction failed: {e}")
     
     def _match_captions(self):
         """Match captions with figures and tables"""
-        if not self.extractors['caption_matcher']:
+        caption_matcher = self._get_extractor('caption_matcher')
+        if not caption_matcher:
             return
         
         try:
-            self.extractors['caption_matcher'].match_captions(self.results)
+            caption_matcher.match_captions(self.results)
         except Exception as e:
             logger.warning(f"Caption matching failed: {e}")
     
@@ -297,16 +566,102 @@ class PDFProcessor:
         
         # Sort content by page and vertical position
         for content_type in self.results['content'].values():
-            if isinstance(content_type, list):
-                content_type.sort(key=lambda x: (x.get('page', 0), x.get('bbox', [0, 0, 0, 0])[1]))
+            if isinstance(content_type, list) and len(content_type) > 1:
+                pages = [x.get('page', 0) for x in content_type]
+                if all(a <= b for a, b in zip(pages, pages[1:])):
+                    # Pages are stored in order, so only each page's items need sorting
+                    ordered = []
+                    for _, indices in groupby(range(len(content_type)), key=pages.__getitem__):
+                        keys = [((content_type[i].get('bbox') or _ZERO_BBOX)[1], i) for i in indices]
+                        keys.sort()
+                        ordered.extend(content_type[i] for _, i in keys)
+                    content_type[:] = ordered
+                    continue
+                
+                # Build the (page, y, index) keys in one pass; the index keeps the sort
+                # stable and means the items themselves are never compared
+                keys = [
+                    (page, (x.get('bbox') or _ZERO_BBOX)[1], i)
+                    for i, (page, x) in enumerate(zip(pages, content_type))
+                ]
+                keys.sort()
+                content_type[:] = [content_type[i] for _, _, i in keys]
     
-    def _generate_outputs(self):
+    def _generate_outputs(self, output_manager: OutputManager, results: Dict[str, Any]):
         """Generate all output files"""
         try:
-            self.output_manager.generate_outputs(self.results)
+            output_manager.generate_outputs(results)
         except Exception as e:
             logger.error(f"Output generation failed: {e}")
     
+    def wait_for_outputs(self):
+        """Block until the output files of the last processed PDF are written"""
+        if self.output_future is not None:
+            self.output_future.result()
+    
+    def process_batch(self, pdf_paths: Iterable[str], output_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Process several PDFs, one document per worker process.
+        
+        The worker pool is created on first use and kept until close(), so worker
+        start-up and model loading are paid once per worker rather than once per
+        document. Each worker processes its documents sequentially.
+        
+        Args:
+            pdf_paths: Paths to the PDF files
+            output_dir: Optional output directory (overrides config)
+            
+        Yields:
+            Each document's results, in input order, once its output files are written
+        """
+        pdf_paths = [str(pdf_path) for pdf_path in pdf_paths]
+        cpu_count = os.cpu_count() or 1
+        max_workers = min(cpu_count, self.config.max_workers or cpu_count, len(pdf_paths))
+        
+        if not self.config.parallel_processing or max_workers <= 1:
+            for pdf_path in pdf_paths:
+                results = self.process_pdf(pdf_path, output_dir)
+                self.wait_for_outputs()
+                yield results
+            return
+        
+        if self._batch_pool is None:
+            self._batch_pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=pool_mp_context(self.config))
+        
+        futures = [
+            self._batch_pool.submit(_process_batch_document, pdf_path, output_dir, self.config)
+            for pdf_path in pdf_paths
+        ]
+        try:
+            for future in futures:
+                self.results = future.result()
+                yield self.results
+        finally:
+            # Stopped early (or failed): drop the documents that have not started
+            for future in futures:
+                future.cancel()
+    
+    def close(self):
+        """Finish writing pending output files and stop the output thread and worker processes"""
+        if self._output_pool is not None:
+            self._output_pool.shutdown(wait=True)
+            self._output_pool = None
+        self.output_future = None
+        
+        if self._page_pool is not None:
+            self._page_pool.shutdown(wait=True)
+            self._page_pool = None
+        
+        if self._batch_pool is not None:
+            self._batch_pool.shutdown(wait=True)
+            self._batch_pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def get_summary(self) -> Dict[str, int]:
         """Get a summary of extracted content"""
         if not self.results:
@@ -320,5 +675,19 @@ class PDFProcessor:
     
     def save_results(self, filepath: str):
         """Save processing results to JSON file"""
+        if ORJSON_AVAILABLE:
+            try:
+                payload = orjson.dumps(
+                    self.results, default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                )
+            except orjson.JSONEncodeError as e:
+                # e.g. integers beyond 64 bits, which json handles
+                logger.debug(f"orjson could not serialize results, using json: {e}")
+            else:
+                with open(filepath, 'wb') as f:
+                    f.write(payload)
+                return
+        
         with open(filepath, 'w') as f:
             json.dump(self.results, f, indent=2, default=str)
@@ -3,6 +3,7 @@ Utility modules for PDF processing pipeline
 """
 
 from .output_manager import OutputManager
+from .page_bundle import PageBundle
 from .pdf_utils import PDFUtils
 
-__all__ = ['OutputManager', 'PDFUtils']
+__all__ = ['OutputManager', 'PageBundle', 'PDFUtils']
@@ -0,0 +1,47 @@
+"""
+Numeric kernels for bounding box geometry
+
+Compiled with Numba when it is installed; otherwise PDFUtils uses NumPy
+broadcasting instead. Boxes are rows of (N, 4) float64 arrays of x0, y0, x1, y1.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback decorator that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def _overlap(a, i, b, j):
+    """Overlap area of box i of a and box j of b"""
+    width = min(a[i, 2], b[j, 2]) - max(a[i, 0], b[j, 0])
+    height = min(a[i, 3], b[j, 3]) - max(a[i, 1], b[j, 1])
+    if width <= 0.0 or height <= 0.0:
+        return 0.0
+    return width * height
+
+
+@njit(cache=True)
+def pairwise_iou(a, b):
+    """(N, M) intersection over union between the boxes of a and b; 0 without overlap or area"""
+    result = np.zeros((a.shape[0], b.shape[0]))
+    for i in range(a.shape[0]):
+        area_a = abs((a[i, 2] - a[i, 0]) * (a[i, 3] - a[i, 1]))
+        for j in range(b.shape[0]):
+            intersection = _overlap(a, i, b, j)
+            if intersection == 0.0:
+                continue
+            union = area_a + abs((b[j, 2] - b[j, 0]) * (b[j, 3] - b[j, 1])) - intersection
+            if union > 0.0:
+                result[i, j] = intersection / union
+    return result
+
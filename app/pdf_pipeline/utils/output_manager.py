@@ -4,14 +4,138 @@ Output management for PDF processing pipeline
 
 import json
 import logging
+import math
+import os
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from ..config import ProcessingConfig
 
 logger = logging.getLogger(__name__)
 
+_ZERO_BBOX = (0, 0, 0, 0)
+
+# Block types written to the main text, and those the exclude_* options drop
+_MAIN_TEXT_TYPES = frozenset({'body', 'title'})
+_HEADER_FOOTER_TYPES = frozenset({'header', 'footer'})
+_PAGE_NUMBER_TYPES = frozenset({'page_number'})
+
+# File type descriptions for the file listing, by extension
+_FILE_TYPES = {
+    '.json': 'JSON data',
+    '.txt': 'Plain text',
+    '.md': 'Markdown',
+    '.csv': 'CSV table',
+    '.xlsx': 'Excel table',
+    '.png': 'PNG image',
+    '.jpg': 'JPEG image',
+    '.jpeg': 'JPEG image',
+    '.pdf': 'PDF document'
+}
+
+# Buffer size for text outputs, so fragments are written out in large chunks
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _write_bytes(path: Path, payload: bytes):
+    """Write payload to path with as few write calls as the OS allows (usually one)"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _encode_json(data: Any) -> bytes:
+    """
+    Encode data as indented UTF-8 JSON, converting unknown objects with str.
+    
+    The encoder only calls str on values it cannot serialize itself, so the
+    data is not copied or walked beforehand. Dataclass instances are converted
+    with str too, as json does. Uses orjson when available, falling back to
+    json for data it rejects (e.g. integers beyond 64 bits).
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                data, default=str,
+                option=(orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                        | orjson.OPT_PASSTHROUGH_DATACLASS)
+            )
+        except orjson.JSONEncodeError as e:
+            logger.debug(f"orjson could not serialize data, using json: {e}")
+    
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _write_json(path: Path, data: Any):
+    """Write data as indented UTF-8 JSON (see _encode_json), encoded in memory and written in one go"""
+    _write_bytes(path, _encode_json(data))
+
+
+def _ensure_dir(path: Path):
+    """Create path and its parents unless it is already a directory (one stat on re-runs)"""
+    if not os.path.isdir(path):
+        path.mkdir(parents=True, exist_ok=True)
+
+
+def _average_truthy(items: List[Dict], key: str) -> Optional[float]:
+    """Average of the items' non-zero, non-missing values for key, or None if there are none"""
+    total = 0
+    count = 0
+    for item in items:
+        value = item.get(key)
+        if value:
+            total += value
+            count += 1
+    return total / count if count else None
+
+
+@lru_cache(maxsize=4096)
+def _iso_second(second: int) -> str:
+    """Local ISO 8601 time of a whole-second timestamp"""
+    return datetime.datetime.fromtimestamp(second).isoformat()
+
+
+def _iso_timestamp(timestamp: float) -> str:
+    """
+    datetime.fromtimestamp(timestamp).isoformat(), with the date and time part
+    cached per second; files written in one run mostly share a few seconds.
+    """
+    second = math.floor(timestamp)
+    microsecond = round((timestamp - second) * 1e6)
+    if microsecond == 1000000:
+        second += 1
+        microsecond = 0
+    iso_second = _iso_second(second)
+    return f"{iso_second}.{microsecond:06d}" if microsecond else iso_second
+
+
+def _scan_files(directory: str, prefix: str = ''):
+    """
+    Yield (relative path, DirEntry) for every file below directory.
+    
+    Symlinked directories are not descended into. DirEntry caches its stat
+    result, so each file is stat'ed once.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_files(entry.path, prefix + entry.name + os.sep)
+            elif entry.is_file():
+                yield prefix + entry.name, entry
+
 
 class OutputManager:
     """
@@ -27,16 +151,16 @@ class OutputManager:
     def __init__(self, config: ProcessingConfig):
         self.config = config
         
-        # Create output directory structure
+        # Create output directory structure; creating the subdirectories also
+        # creates the output directory
         self.output_dir = Path(self.config.output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Create subdirectories
         self.subdirs = {}
         subdirectories = ['images', 'tables', 'formulas', 'text', 'reports']
         for subdir in subdirectories:
             path = self.output_dir / subdir
-            path.mkdir(exist_ok=True)
+            _ensure_dir(path)
             self.subdirs[subdir] = path
     
     def generate_outputs(self, results: Dict):
@@ -49,22 +173,37 @@ class OutputManager:
         try:
             logger.info("Generating output files")
             
-            # Generate JSON manifest
-            if self.config.create_manifest:
-                self._generate_manifest(results)
-            
-            # Generate plain text file
-            if self.config.create_main_text:
-                self._generate_main_text(results)
-            
-            # Generate summary report
-            self._generate_summary_report(results)
+            # The manifest and summary report share one statistics pass. If it
+            # fails, each retries it and reports the failure itself
+            try:
+                stats = self._generate_statistics(results)
+            except Exception:
+                stats = None
             
-            # Generate detailed reports
-            self._generate_detailed_reports(results)
+            # The outputs are independent, so they are encoded and written concurrently
+            with ThreadPoolExecutor(max_workers=4, thread_name_prefix='pdf-report') as executor:
+                futures = []
+                
+                # Generate JSON manifest
+                if self.config.create_manifest:
+                    futures.append(executor.submit(self._generate_manifest, results, stats))
+                
+                # Generate plain text file
+                if self.config.create_main_text:
+                    futures.append(executor.submit(self._generate_main_text, results))
+                
+                # Generate summary report
+                futures.append(executor.submit(self._generate_summary_report, results, stats))
+                
+                # Generate detailed reports
+                futures.append(executor.submit(self._generate_detailed_reports, results))
+                
+                for future in futures:
+                    future.result()
             
-            # Generate file listing
-            self._generate_file_listing(results)
+            # Generate file listing once the other files are written
+            if self.config.create_file_listing:
+                self._generate_file_listing(results)
             
             logger.info(f"All output files generated in: {self.output_dir}")
             
@@ -72,9 +211,12 @@ class OutputManager:
             logger.error(f"Output generation failed: {e}")
             raise
     
-    def _generate_manifest(self, results: Dict):
-        """Generate comprehensive JSON manifest"""
+    def _generate_manifest(self, results: Dict, stats: Optional[Dict] = None):
+        """Generate comprehensive JSON manifest (stats: _generate_statistics result, if computed)"""
         try:
+            if stats is None:
+                stats = self._generate_statistics(results)
+            
             manifest = {
                 'metadata': results.get('metadata', {}),
                 'processing_info': {
@@ -85,17 +227,13 @@ class OutputManager:
                 },
                 'content': results.get('content', {}),
                 'artifacts': results.get('artifacts', {}),
-                'statistics': self._generate_statistics(results),
+                'statistics': stats,
                 'file_organization': self._get_file_organization()
             }
             
-            # Clean up the manifest (remove non-serializable items)
-            manifest = self._clean_for_json(manifest)
-            
             # Save manifest
             manifest_path = self.output_dir / "manifest.json"
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                json.dump(manifest, f, indent=2, ensure_ascii=False, default=str)
+            _write_json(manifest_path, manifest)
             
             logger.info(f"Generated manifest: {manifest_path}")
             
@@ -111,57 +249,56 @@ class OutputManager:
                 logger.warning("No text blocks found for main text generation")
                 return
             
-            # Sort by page and position
-            sorted_blocks = sorted(text_blocks, key=lambda x: (
-                x.get('page', 0),
-                x.get('bbox', [0, 0, 0, 0])[1]  # Y position
-            ))
-            
-            # Filter out headers, footers, etc. if configured
-            main_text_blocks = []
-            for block in sorted_blocks:
-                block_type = block.get('type', 'body')
-                
-                # Skip non-body text based on configuration
-                if self.config.exclude_headers_footers and block_type in ['header', 'footer']:
-                    continue
-                if self.config.exclude_page_numbers and block_type == 'page_number':
-                    continue
-                
-                # Include body text and titles
-                if block_type in ['body', 'title']:
-                    main_text_blocks.append(block)
-            
-            # Generate text content
-            text_content = []
-            current_page = None
-            
-            for block in main_text_blocks:
-                page = block.get('page', 0)
-                text = block.get('text', '').strip()
-                
-                if not text:
-                    continue
-                
-                # Add page separator
-                if current_page is not None and page != current_page:
-                    text_content.append(f"\\n\\n=== Page {page + 1} ===\\n")
-                elif current_page is None:
-                    text_content.append(f"=== Page {page + 1} ===\\n")
-                
-                # Add text with some formatting
-                block_type = block.get('type', 'body')
-                if block_type == 'title':
-                    text_content.append(f"\\n## {text}\\n")
-                else:
-                    text_content.append(text)
-                
-                current_page = page
-            
-            # Write to file
+            # Types to include: body text and titles, less anything the config
+            # excludes. Decided once here rather than per block
+            included_types = _MAIN_TEXT_TYPES
+            if self.config.exclude_headers_footers:
+                included_types -= _HEADER_FOOTER_TYPES
+            if self.config.exclude_page_numbers:
+                included_types -= _PAGE_NUMBER_TYPES
+            
+            # Filter, then sort by page and Y position. The (page, y, index) keys are
+            # built in one pass; the index keeps the sort stable without comparing
+            # the blocks
+            keys = [
+                (block.get('page', 0), (block.get('bbox') or _ZERO_BBOX)[1], i)
+                for i, block in enumerate(text_blocks)
+                if block.get('type', 'body') in included_types
+            ]
+            keys.sort()
+            main_text_blocks = [text_blocks[i] for _, _, i in keys]
+            
+            # Write text content as it is generated, with the fragments separated
+            # as if joined
             text_path = self.subdirs['text'] / "main_text.txt"
-            with open(text_path, 'w', encoding='utf-8') as f:
-                f.write('\\n'.join(text_content))
+            with open(text_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+                separator = ''
+                current_page = None
+                
+                for block in main_text_blocks:
+                    page = block.get('page', 0)
+                    text = block.get('text', '').strip()
+                    
+                    if not text:
+                        continue
+                    
+                    # Add page separator
+                    if current_page is not None and page != current_page:
+                        f.write(separator)
+                        f.write(f"\\n\\n=== Page {page + 1} ===\\n")
+                    elif current_page is None:
+                        f.write(f"=== Page {page + 1} ===\\n")
+                    separator = '\\n'
+                    
+                    # Add text with some formatting
+                    f.write(separator)
+                    block_type = block.get('type', 'body')
+                    if block_type == 'title':
+                        f.write(f"\\n## {text}\\n")
+                    else:
+                        f.write(text)
+                    
+                    current_page = page
             
             logger.info(f"Generated main text file: {text_path}")
             
@@ -174,55 +311,55 @@ class OutputManager:
     def _generate_markdown_text(self, text_blocks: List[Dict]):
         """Generate markdown version of main text"""
         try:
-            markdown_content = []
-            current_page = None
-            
-            for block in text_blocks:
-                page = block.get('page', 0)
-                text = block.get('text', '').strip()
-                block_type = block.get('type', 'body')
-                
-                if not text:
-                    continue
-                
-                # Add page break
-                if current_page is not None and page != current_page:
-                    markdown_content.append(f"\\n\\n---\\n")
-                    markdown_content.append(f"\\n## Page {page + 1}\\n")
-                elif current_page is None:
-                    markdown_content.append(f"# Document Content\\n\\n## Page {page + 1}\\n")
-                
-                # Format based on type
-                if block_type == 'title':
-                    markdown_content.append(f"\\n### {text}\\n")
-                else:
-                    markdown_content.append(f"{text}\\n")
-                
-                current_page = page
-            
-            # Save markdown
+            # Write markdown content as it is generated, with the fragments
+            # separated as if joined
             md_path = self.subdirs['text'] / "main_text.md"
-            with open(md_path, 'w', encoding='utf-8') as f:
-                f.write('\\n'.join(markdown_content))
+            with open(md_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+                current_page = None
+                
+                for block in text_blocks:
+                    page = block.get('page', 0)
+                    text = block.get('text', '').strip()
+                    block_type = block.get('type', 'body')
+                    
+                    if not text:
+                        continue
+                    
+                    # Add page break
+                    if current_page is not None and page != current_page:
+                        f.write(f"\\n\\n\\n---\\n\\n\\n## Page {page + 1}\\n")
+                    elif current_page is None:
+                        f.write(f"# Document Content\\n\\n## Page {page + 1}\\n")
+                    
+                    # Format based on type
+                    if block_type == 'title':
+                        f.write(f"\\n\\n### {text}\\n")
+                    else:
+                        f.write(f"\\n{text}\\n")
+                    
+                    current_page = page
             
             logger.info(f"Generated markdown text: {md_path}")
             
         except Exception as e:
             logger.debug(f"Failed to generate markdown: {e}")
     
-    def _generate_summary_report(self, results: Dict):
-        """Generate summary report"""
+    def _generate_summary_report(self, results: Dict, stats: Optional[Dict] = None):
+        """Generate summary report (stats: _generate_statistics result, if computed)"""
         try:
+            if stats is None:
+                stats = self._generate_statistics(results)
+            
             summary = {
                 'document_info': {
                     'source_file': results['metadata'].get('source_file'),
                     'total_pages': results['metadata'].get('total_pages'),
                     'processing_time': results['metadata'].get('processing_time'),
                 },
-                'content_summary': self._generate_statistics(results),
+                'content_summary': stats,
                 'processing_details': {
                     'layout_detection': 'layout_detector' in results['metadata'].get('config', {}),
-                    'ocr_used': any(
+                    'ocr_used': self.config.ocr_enabled and any(
                         block.get('source') == 'ocr' 
                         for block in results['content'].get('text_blocks', [])
                     ),
@@ -241,8 +378,7 @@ class OutputManager:
             
             # Save as JSON
             summary_path = self.subdirs['reports'] / "summary.json"
-            with open(summary_path, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2, default=str)
+            _write_json(summary_path, summary)
             
             # Save as human-readable text
             self._generate_text_summary(summary)
@@ -310,7 +446,7 @@ class OutputManager:
             
             # Save text summary
             summary_text_path = self.subdirs['reports'] / "summary.txt"
-            with open(summary_text_path, 'w', encoding='utf-8') as f:
+            with open(summary_text_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
                 f.write('\\n'.join(lines))
             
         except Exception as e:
@@ -320,11 +456,22 @@ class OutputManager:
         """Generate detailed reports for each content type"""
         try:
             content = results.get('content', {})
+            reports = [
+                (content_type, items) for content_type, items in content.items()
+                if isinstance(items, list) and items
+            ]
+            if not reports:
+                return
             
-            # Generate detailed reports for each content type
-            for content_type, items in content.items():
-                if isinstance(items, list) and items:
-                    self._generate_content_type_report(content_type, items)
+            # Generate detailed reports for each content type; each is its own
+            # file, so they are written concurrently
+            with ThreadPoolExecutor(max_workers=min(4, len(reports)), thread_name_prefix='pdf-report') as executor:
+                futures = [
+                    executor.submit(self._generate_content_type_report, content_type, items)
+                    for content_type, items in reports
+                ]
+                for future in futures:
+                    future.result()
             
         except Exception as e:
             logger.error(f"Failed to generate detailed reports: {e}")
@@ -332,50 +479,57 @@ class OutputManager:
     def _generate_content_type_report(self, content_type: str, items: List[Dict]):
         """Generate detailed report for a specific content type"""
         try:
-            report = {
-                'content_type': content_type,
-                'total_count': len(items),
-                'items': []
-            }
-            
-            for i, item in enumerate(items):
-                item_info = {
-                    'index': i + 1,
-                    'page': item.get('page'),
-                    'bbox': item.get('bbox'),
-                    'text': item.get('text', '')[:200] + '...' if len(item.get('text', '')) > 200 else item.get('text', ''),
-                }
+            report_path = self.subdirs['reports'] / f"{content_type}_report.json"
+            with open(report_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                # The report is written as it is built: each item is encoded on its
+                # own and indented to its place in the items array, so the file is
+                # laid out as if the whole report had been encoded at once
+                header = _encode_json({'content_type': content_type, 'total_count': len(items)})
+                f.write(header[:-2])  # Without the closing "\n}"
+                f.write(b',\n  "items": [')
                 
-                # Add type-specific information
-                if content_type == 'tables':
-                    item_info.update({
-                        'rows': item.get('rows'),
-                        'columns': item.get('columns'),
-                        'accuracy': item.get('accuracy'),
-                        'method': item.get('method')
-                    })
-                elif content_type == 'formulas':
-                    item_info.update({
-                        'math_score': item.get('math_score'),
-                        'features': item.get('features')
-                    })
-                elif content_type == 'images':
-                    item_info.update({
-                        'size': item.get('size'),
-                        'format': item.get('format'),
-                        'file_path': item.get('file_path')
-                    })
+                for i, item in enumerate(items):
+                    f.write(b',\n    ' if i else b'\n    ')
+                    item_info = self._report_item_info(content_type, i, item)
+                    f.write(_encode_json(item_info).replace(b'\n', b'\n    '))
                 
-                report['items'].append(item_info)
-            
-            # Save report
-            report_path = self.subdirs['reports'] / f"{content_type}_report.json"
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, default=str)
+                f.write(b'\n  ]\n}')
             
         except Exception as e:
             logger.debug(f"Failed to generate {content_type} report: {e}")
     
+    def _report_item_info(self, content_type: str, i: int, item: Dict) -> Dict:
+        """Entry i of a content type report's items array"""
+        text = item.get('text', '')
+        item_info = {
+            'index': i + 1,
+            'page': item.get('page'),
+            'bbox': item.get('bbox'),
+            'text': text[:200] + '...' if len(text) > 200 else text,
+        }
+        
+        # Add type-specific information
+        if content_type == 'tables':
+            item_info.update({
+                'rows': item.get('rows'),
+                'columns': item.get('columns'),
+                'accuracy': item.get('accuracy'),
+                'method': item.get('method')
+            })
+        elif content_type == 'formulas':
+            item_info.update({
+                'math_score': item.get('math_score'),
+                'features': item.get('features')
+            })
+        elif content_type == 'images':
+            item_info.update({
+                'size': item.get('size'),
+                'format': item.get('format'),
+                'file_path': item.get('file_path')
+            })
+        
+        return item_info
+    
     def _generate_file_listing(self, results: Dict):
         """Generate listing of all output files"""
         try:
@@ -386,25 +540,23 @@ class OutputManager:
             }
             
             # Scan output directory
-            for file_path in self.output_dir.rglob('*'):
-                if file_path.is_file():
-                    relative_path = file_path.relative_to(self.output_dir)
-                    file_info = {
-                        'path': str(relative_path),
-                        'name': file_path.name,
-                        'size': file_path.stat().st_size,
-                        'type': self._get_file_type(file_path),
-                        'created': datetime.datetime.fromtimestamp(file_path.stat().st_ctime).isoformat()
-                    }
-                    file_listing['files'].append(file_info)
+            for relative_path, entry in _scan_files(str(self.output_dir)):
+                file_stat = entry.stat()
+                file_info = {
+                    'path': relative_path,
+                    'name': entry.name,
+                    'size': file_stat.st_size,
+                    'type': self._get_file_type(entry.name),
+                    'created': _iso_timestamp(file_stat.st_ctime)
+                }
+                file_listing['files'].append(file_info)
             
             # Sort by path
             file_listing['files'].sort(key=lambda x: x['path'])
             
             # Save listing
             listing_path = self.output_dir / "file_listing.json"
-            with open(listing_path, 'w', encoding='utf-8') as f:
-                json.dump(file_listing, f, indent=2)
+            _write_json(listing_path, file_listing)
             
         except Exception as e:
             logger.debug(f"Failed to generate file listing: {e}")
@@ -413,19 +565,26 @@ class OutputManager:
         """Generate statistics from processing results"""
         content = results.get('content', {})
         stats = {}
+        total_items = 0
         
         for content_type, items in content.items():
             if isinstance(items, list):
                 stats[content_type] = len(items)
+                total_items += len(items)
         
         # Add derived statistics
-        stats['total_content_items'] = sum(stats.values())
+        stats['total_content_items'] = total_items
         
         # Text statistics
         text_blocks = content.get('text_blocks', [])
         if text_blocks:
-            total_chars = sum(len(block.get('text', '')) for block in text_blocks)
-            total_words = sum(len(block.get('text', '').split()) for block in text_blocks)
+            # One pass for both totals; split() keeps word counts exact
+            total_chars = 0
+            total_words = 0
+            for block in text_blocks:
+                text = block.get('text', '')
+                total_chars += len(text)
+                total_words += len(text.split())
             stats['total_characters'] = total_chars
             stats['total_words'] = total_words
             stats['average_words_per_block'] = total_words / len(text_blocks)
@@ -441,29 +600,35 @@ class OutputManager:
             
             # Text quality metrics
             text_blocks = content.get('text_blocks', [])
-            if text_blocks:
-                # Calculate OCR vs native text ratio
-                ocr_blocks = [b for b in text_blocks if b.get('source') == 'ocr']
-                metrics['ocr_text_ratio'] = len(ocr_blocks) / len(text_blocks)
+            if text_blocks and not self.config.ocr_enabled:
+                # Only the OCR processor produces OCR blocks
+                metrics['ocr_text_ratio'] = 0.0
+            elif text_blocks:
+                # OCR vs native text ratio and average OCR confidence in one pass
+                ocr_count = 0
+                confidence_sum = 0
+                confidence_count = 0
+                for block in text_blocks:
+                    if block.get('source') == 'ocr':
+                        ocr_count += 1
+                        confidence = block.get('confidence')
+                        if confidence:
+                            confidence_sum += confidence
+                            confidence_count += 1
                 
-                # Average confidence for OCR text
-                ocr_confidences = [b.get('confidence', 0) for b in ocr_blocks if b.get('confidence')]
-                if ocr_confidences:
-                    metrics['average_ocr_confidence'] = sum(ocr_confidences) / len(ocr_confidences)
+                metrics['ocr_text_ratio'] = ocr_count / len(text_blocks)
+                if confidence_count:
+                    metrics['average_ocr_confidence'] = confidence_sum / confidence_count
             
             # Table quality metrics
-            tables = content.get('tables', [])
-            if tables:
-                table_accuracies = [t.get('accuracy', 0) for t in tables if t.get('accuracy')]
-                if table_accuracies:
-                    metrics['average_table_accuracy'] = sum(table_accuracies) / len(table_accuracies)
+            average_accuracy = _average_truthy(content.get('tables', []), 'accuracy')
+            if average_accuracy is not None:
+                metrics['average_table_accuracy'] = average_accuracy
             
             # Formula detection confidence
-            formulas = content.get('formulas', [])
-            if formulas:
-                formula_scores = [f.get('math_score', 0) for f in formulas if f.get('math_score')]
-                if formula_scores:
-                    metrics['average_formula_score'] = sum(formula_scores) / len(formula_scores)
+            average_score = _average_truthy(content.get('formulas', []), 'math_score')
+            if average_score is not None:
+                metrics['average_formula_score'] = average_score
         
         except Exception as e:
             logger.debug(f"Failed to calculate quality metrics: {e}")
@@ -472,7 +637,7 @@ class OutputManager:
     
     def _get_file_organization(self) -> Dict:
         """Get file organization structure"""
-        return {
+        organization = {
             'base_directory': str(self.output_dir),
             'subdirectories': {
                 name: str(path) for name, path in self.subdirs.items()
@@ -487,32 +652,11 @@ class OutputManager:
                 'file_listing.json': 'Complete listing of generated files'
             }
         }
+        if not self.config.create_file_listing:
+            del organization['structure']['file_listing.json']
+        return organization
     
-    def _get_file_type(self, file_path: Path) -> str:
+    def _get_file_type(self, file_path: Union[str, Path]) -> str:
         """Determine file type from extension"""
-        suffix = file_path.suffix.lower()
-        
-        type_mapping = {
-            '.json': 'JSON data',
-            '.txt': 'Plain text',
-            '.md': 'Markdown',
-            '.csv': 'CSV table',
-            '.xlsx': 'Excel table',
-            '.png': 'PNG image',
-            '.jpg': 'JPEG image',
-            '.jpeg': 'JPEG image',
-            '.pdf': 'PDF document'
-        }
-        
-        return type_mapping.get(suffix, 'Unknown')
-    
-    def _clean_for_json(self, obj: Any) -> Any:
-        """Clean object for JSON serialization"""
-        if isinstance(obj, dict):
-            return {k: self._clean_for_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._clean_for_json(item) for item in obj]
-        elif hasattr(obj, '__dict__'):
-            return str(obj)  # Convert objects to string representation
-        else:
-            return obj
+        suffix = os.path.splitext(file_path)[1].lower()
+        return _FILE_TYPES.get(suffix, 'Unknown')
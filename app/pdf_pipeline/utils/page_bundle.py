@@ -0,0 +1,50 @@
+"""
+Per-page PyMuPDF extractions shared between extractors
+"""
+
+from functools import cached_property
+from typing import Dict, List, Optional
+
+
+class PageBundle:
+    """
+    A PDF page together with the PyMuPDF extractions the extractors share.
+
+    Each extraction runs on first access and is then reused, so the page's
+    content stream is interpreted once per kind of data rather than once per
+    extractor that needs it.
+    """
+
+    def __init__(self, page, text_flags: Optional[int] = None):
+        """
+        Args:
+            page: PyMuPDF page object
+            text_flags: Flags for the text dict extraction (PyMuPDF's default if None)
+        """
+        self.page = page
+        self.text_flags = text_flags
+
+    @cached_property
+    def text_dict(self) -> Dict:
+        """The page text with detailed formatting info"""
+        if self.text_flags is None:
+            return self.page.get_text("dict")
+        return self.page.get_text("dict", flags=self.text_flags)
+
+    @cached_property
+    def images(self) -> List[tuple]:
+        """The page's image list, as page.get_images(full=True)"""
+        return self.page.get_images(full=True)
+
+    @cached_property
+    def image_bboxes(self) -> Dict[int, tuple]:
+        """Bounding box of the first placement of each image on the page, by xref"""
+        bboxes = {}
+        for info in self.page.get_image_info(xrefs=True):
+            bboxes.setdefault(info.get("xref"), info.get("bbox"))
+        return bboxes
+
+    @cached_property
+    def drawings(self) -> List[Dict]:
+        """The page's vector drawings, as page.get_drawings()"""
+        return self.page.get_drawings()
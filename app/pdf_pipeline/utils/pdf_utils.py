@@ -3,10 +3,17 @@ PDF utility functions for the processing pipeline
 """
 
 import logging
+import mmap
+import os
+from contextlib import contextmanager
 from typing import List, Dict, Tuple, Optional, Union
 import statistics
 import re
 
+import numpy as np
+
+from . import _bbox_kernels
+
 try:
     import fitz  # PyMuPDF
 except ImportError:
@@ -14,6 +21,71 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Below this many boxes the list-based helpers stay in plain Python
+_VECTORIZE_MIN = 8
+
+
+def _as_bbox_array(bboxes) -> np.ndarray:
+    """Stack bounding boxes (x0, y0, x1, y1) into a float64 (N, 4) array"""
+    return np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+
+@contextmanager
+def mapped_pdf(pdf_path: str, sequential: bool = False):
+    """
+    Map a PDF read-only and ask the kernel to read it ahead.
+    
+    PyMuPDF, Camelot, Tabula and the worker processes all open the file by path;
+    holding the mapping keeps their reads in the page cache instead of going back
+    to disk. Yields the mapping, or None if the file cannot be mapped.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        sequential: Also hint that the file will be read front to back
+    """
+    try:
+        pdf_file = open(pdf_path, 'rb')
+    except OSError as e:
+        logger.debug(f"Could not open {pdf_path} for mapping: {e}")
+        yield None
+        return
+    
+    try:
+        # Start reading the file into the page cache right away, so the first
+        # pages are not read on demand while later ones are still on disk. This
+        # also covers files that cannot be mapped
+        if hasattr(os, 'posix_fadvise'):
+            advice = ['POSIX_FADV_SEQUENTIAL', 'POSIX_FADV_WILLNEED'] if sequential else ['POSIX_FADV_WILLNEED']
+            for name in advice:
+                if hasattr(os, name):
+                    try:
+                        os.posix_fadvise(pdf_file.fileno(), 0, 0, getattr(os, name))
+                    except OSError:
+                        pass
+        
+        try:
+            mapped = mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not map {pdf_path}: {e}")
+            mapped = None
+        
+        if mapped is not None and hasattr(mapped, 'madvise'):
+            advice = ['MADV_SEQUENTIAL', 'MADV_WILLNEED'] if sequential else ['MADV_WILLNEED']
+            for name in advice:
+                if hasattr(mmap, name):
+                    try:
+                        mapped.madvise(getattr(mmap, name))
+                    except OSError:
+                        pass
+        
+        try:
+            yield mapped
+        finally:
+            if mapped is not None:
+                mapped.close()
+    finally:
+        pdf_file.close()
+
 
 class PDFUtils:
     """
@@ -99,6 +171,37 @@ class PDFUtils:
         dy = max(0, max(bbox1[1] - bbox2[3], bbox2[1] - bbox1[3]))
         return (dx**2 + dy**2)**0.5
     
+    @staticmethod
+    def bbox_areas_np(bboxes) -> np.ndarray:
+        """Areas of N bounding boxes, as bbox_area, in an (N,) array"""
+        boxes = _as_bbox_array(bboxes)
+        return np.abs((boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]))
+    
+    @staticmethod
+    def pairwise_overlap_np(bboxes1, bboxes2) -> np.ndarray:
+        """Overlap areas, as bbox_overlap, between N and M bounding boxes in an (N, M) array"""
+        a = _as_bbox_array(bboxes1)
+        b = _as_bbox_array(bboxes2)
+        top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+        bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+        return np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    
+    @staticmethod
+    def pairwise_iou_np(bboxes1, bboxes2) -> np.ndarray:
+        """Intersection over union, as bbox_overlap_ratio, between N and M bounding boxes in an (N, M) array"""
+        if _bbox_kernels.NUMBA_AVAILABLE:
+            # Compiled loops avoid the (N, M, 2) temporaries of the NumPy path
+            return _bbox_kernels.pairwise_iou(_as_bbox_array(bboxes1), _as_bbox_array(bboxes2))
+        
+        intersection = PDFUtils.pairwise_overlap_np(bboxes1, bboxes2)
+        union = (PDFUtils.bbox_areas_np(bboxes1)[:, None] + PDFUtils.bbox_areas_np(bboxes2)[None, :]
+                 - intersection)
+        
+        # Pairs that do not overlap, or have no area, get 0
+        iou = np.zeros_like(intersection)
+        np.divide(intersection, union, out=iou, where=(intersection != 0) & (union > 0))
+        return iou
+    
     @staticmethod
     def bbox_center(bbox: List[float]) -> Tuple[float, float]:
         """Get center point of bounding box"""
@@ -120,6 +223,12 @@ class PDFUtils:
         if not bboxes:
             return [0, 0, 0, 0]
         
+        if len(bboxes) >= _VECTORIZE_MIN:
+            boxes = np.asarray(bboxes)
+            if boxes.ndim == 2 and boxes.shape[1] >= 4 and boxes.dtype.kind in 'if':
+                # Same result from column-wise reductions; tolist keeps ints as ints
+                return [*boxes[:, :2].min(axis=0).tolist(), *boxes[:, 2:4].max(axis=0).tolist()]
+        
         min_x = min(bbox[0] for bbox in bboxes)
         min_y = min(bbox[1] for bbox in bboxes)
         max_x = max(bbox[2] for bbox in bboxes)
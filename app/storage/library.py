@@ -27,6 +27,12 @@ CREATE TABLE IF NOT EXISTS chunks(
   voice TEXT,
   speed REAL
 );
+CREATE TABLE IF NOT EXISTS doc_id_cache(
+  path TEXT PRIMARY KEY,
+  size INTEGER,
+  mtime_ns INTEGER,
+  doc_id TEXT
+);
 """
 
 class Library:
@@ -59,8 +65,32 @@ class Library:
         self.conn.commit()
 
     def _doc_id(self, pdf_path: str) -> str:
-        h = hashlib.sha256(Path(pdf_path).read_bytes()).hexdigest()[:16]
-        return h
+        # Reuse the id of a file seen before with the same size and mtime
+        path = os.path.abspath(pdf_path)
+        st = os.stat(path)
+        row = self.conn.execute(
+            "SELECT doc_id FROM doc_id_cache WHERE path=? AND size=? AND mtime_ns=?",
+            (path, st.st_size, st.st_mtime_ns)
+        ).fetchone()
+        if row:
+            return row[0]
+
+        # Stream the file through SHA-256 rather than reading it into memory;
+        # ids stay the same as for existing library entries
+        with open(path, "rb") as f:
+            if hasattr(hashlib, "file_digest"):
+                h = hashlib.file_digest(f, "sha256")
+            else:
+                h = hashlib.sha256()
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        doc_id = h.hexdigest()[:16]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO doc_id_cache(path, size, mtime_ns, doc_id) VALUES(?,?,?,?)",
+            (path, st.st_size, st.st_mtime_ns, doc_id)
+        )
+        self.conn.commit()
+        return doc_id
 
     def ensure_document(self, pdf_path: str) -> str:
         pid = self._doc_id(pdf_path)
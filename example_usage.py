@@ -161,6 +161,8 @@ def text_only_example():
         
         print(f"Extracted {len(text_blocks)} text blocks")
         print(f"Total words: {total_words}")
+        
+        processor.wait_for_outputs()
         print("Main text saved to: output_text_only/text/main_text.txt")
         
     except FileNotFoundError:
@@ -223,6 +223,12 @@ Examples:
         help="Don't generate main text file"
     )
     
+    output_group.add_argument(
+        "--no-file-listing",
+        action="store_true",
+        help="Don't generate file listing (skips scanning the output directory)"
+    )
+    
     output_group.add_argument(
         "--include-headers-footers",
         action="store_true",
@@ -336,6 +342,7 @@ def create_config_from_args(args) -> ProcessingConfig:
     # Output settings
     config.create_manifest = not args.no_manifest
     config.create_main_text = not args.no_main_text
+    config.create_file_listing = not args.no_file_listing
     config.exclude_headers_footers = not args.include_headers_footers
     config.exclude_page_numbers = not args.include_page_numbers
     
@@ -539,6 +546,9 @@ def main():
         processing_time = results['metadata'].get('processing_time', 0)
         print(f"\\nProcessing time: {processing_time:.2f} seconds")
         
+        # Output files are written in the background
+        processor.close()
+        
         print(f"\\nResults saved to: {output_dir}")
         print("Main files:")
         print(f"  - Manifest: {output_dir}/manifest.json")
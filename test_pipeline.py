@@ -190,6 +190,253 @@ def test_example_script():
         return False
 
 
+def test_pattern_set_parity():
+    """Test that every pattern set backend matches the original per-pattern regexes"""
+    print("\nTesting classification pattern set backends...")
+    
+    import random
+    import re
+    from unittest import mock
+    from pdf_pipeline import ProcessingConfig
+    from pdf_pipeline.extractors import _pattern_set
+    from pdf_pipeline.extractors.text_classifier import TextClassifier
+    
+    config = ProcessingConfig()
+    caption_keywords = '|'.join(config.caption_keywords)
+    
+    # The patterns as TextClassifier compiled them before the single-pass scan, in bit order;
+    # the citation pattern was searched, all others matched at the start
+    original = [
+        re.compile(r'^\s*(?:page\s*)?(\d+|[ivxlcdm]+)\s*$', re.IGNORECASE).match,
+        re.compile(r'^\s*[\d\*†‡§¶#]+\s*[\.:\-\s]', re.IGNORECASE).match,
+        re.compile(r'\[\d+\]|\(\d{4}\)|et\s+al\.|ibid\.|op\.\s*cit\.', re.IGNORECASE).search,
+        re.compile(rf'^\s*(?:{caption_keywords})\s*[:\d\.]', re.IGNORECASE).match,
+        re.compile(r'^\s*[\d\w]\.\s+').match,
+        re.compile(r'^\s*[a-z]\)\s+').match,
+        re.compile(r'^\s*[•·‣▪▫▸▹◦‧⁃]\s+').match,
+        re.compile(r'^\s*[-\*\+]\s+').match,
+    ]
+    
+    def expected_bits(text):
+        return sum(1 << i for i, match in enumerate(original) if match(text))
+    
+    lines = [
+        "12", "  Page 3 ", "PAGE 10", "iv", "XIV", "page", "Figure 2. Results of the model",
+        "FIG 3: Overview", "fig.4", "Table 1: Accuracy", "tab. 2", "Eq. 3", "Equation (4)",
+        "Algorithm 1: Training", "ALG 2.", "figures 3", "Tables show", "* Corresponding author",
+        "† Equal contribution", "1 See appendix", "‡ note", "as shown in [12] and (2020)",
+        "Smith et al. found", "ET AL. (1999)", "ibid. p. 4", "op. cit. 4", "1. Introduction",
+        "a) first", "A) first", "• bullet", "◦ nested", "- dash", "+ plus", "*emphasis*",
+        "ﬁg. 1: ligature", "ﬁgure 5", "Ⅳ", "１２", "", "   ", "\tFigure\t1:",
+        "The results in Table 2 show that the method works.",
+    ]
+    alphabet = "0123456789 .:-)*+•[]()aeiIfFgGtTbBlLsSxXvVcCdDmMpPuUrRqQ†ﬁ\t"
+    rng = random.Random(0)
+    for _ in range(5000):
+        lines.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))))
+        prefix = rng.choice(["fig", "Figure", "page", "TAB", "eq", "et al.", "op. cit.", "1.", "a)"])
+        lines.append(prefix + ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 5))))
+    
+    # Unicode case-folding tables differ between regex engines, so characters such as
+    # the dotted capital I or the long s are only checked against the re backend
+    re_only_lines = ["İ", "FİG 1:", "PAGE İV", "ſ", "K", "ß. item", "Dİl"]
+    
+    backends = [('re', False, False)]
+    if _pattern_set.RE2_AVAILABLE:
+        backends.append(('re2', False, True))
+    if _pattern_set.HYPERSCAN_AVAILABLE:
+        backends.append(('hyperscan', True, False))
+    
+    for name, use_hyperscan, use_re2 in backends:
+        with mock.patch.object(_pattern_set, 'HYPERSCAN_AVAILABLE', use_hyperscan), \
+                mock.patch.object(_pattern_set, 'RE2_AVAILABLE', use_re2):
+            # The patterns only need the config, not a PyMuPDF-backed classifier
+            classifier = TextClassifier.__new__(TextClassifier)
+            classifier.config = config
+            classifier._compile_patterns()
+        pattern_set = classifier._pattern_set
+        assert pattern_set.backend == name, f"expected the {name} backend, got {pattern_set.backend}"
+        
+        corpus = lines + re_only_lines if name == 're' else lines
+        mismatches = [
+            text for text in corpus
+            if pattern_set.scan(text) & 0xff != expected_bits(text)
+        ]
+        assert not mismatches, f"{name} backend differs on {mismatches[:10]}"
+        print(f"✓ {name} backend matches the original patterns on {len(corpus)} lines")
+    
+    return True
+
+
+def test_label_lines_parity():
+    """Test that both line labelling kernels apply the original classification cascade"""
+    print("\nTesting line labelling kernels...")
+    
+    import numpy as np
+    from pdf_pipeline.extractors import _text_kernels as kernels
+    
+    page_bit, footnote_bits, caption_bit, list_bits = 1, 2 | 4, 8, 16 | 32 | 64 | 128
+    pattern_bits = np.array([page_bit, footnote_bits, caption_bit, list_bits], dtype=np.int64)
+    
+    def original_label(y0, y1, avg_size, features, matches, thresholds):
+        """The rule order of the original per-line _classify_text_line"""
+        header_y, footer_y, footnote_y, footnote_size_max, title_size_min = thresholds
+        in_header_footer = y0 < header_y or y0 > footer_y
+        if features & kernels.FEATURE_SHORT and matches & page_bit and in_header_footer:
+            return kernels.LABEL_PAGE_NUMBER
+        if in_header_footer:
+            return kernels.LABEL_HEADER if y0 < header_y else kernels.LABEL_FOOTER
+        if y1 >= footnote_y and avg_size <= footnote_size_max and matches & footnote_bits:
+            return kernels.LABEL_FOOTNOTE
+        if features & kernels.FEATURE_LAYOUT_CAPTION or matches & caption_bit:
+            return kernels.LABEL_CAPTION
+        if matches & list_bits:
+            return kernels.LABEL_LIST
+        if (features & (kernels.FEATURE_LAYOUT_TITLE | kernels.FEATURE_TITLE_WORD | kernels.FEATURE_BOLD)
+                or avg_size >= title_size_min):
+            return kernels.LABEL_TITLE
+        return kernels.LABEL_BODY
+    
+    implementations = [('vectorized', kernels._label_lines_vectorized), ('loop', kernels._label_lines_loop)]
+    if kernels.NUMBA_AVAILABLE:
+        implementations.append(('loop (uncompiled)', kernels._label_lines_loop.py_func))
+    
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        n_lines = int(rng.integers(0, 60))
+        # Coarse grids so coordinates and sizes often land exactly on a threshold
+        y0 = rng.integers(0, 9, n_lines) * 100.0
+        y1 = y0 + rng.integers(0, 3, n_lines) * 50.0
+        avg_sizes = rng.integers(6, 16, n_lines).astype(np.float64)
+        features = rng.integers(0, 32, n_lines).astype(np.int64)
+        matches = rng.integers(0, 512, n_lines).astype(np.int64)
+        if trial % 4 == 0:
+            # No median font size yet: the size rules are disabled
+            size_limits = [np.inf, np.inf]
+        else:
+            size_limits = [float(rng.integers(6, 16)), float(rng.integers(6, 16))]
+        thresholds = np.array([100.0, 700.0, 600.0] + size_limits, dtype=np.float64)
+        
+        expected = [
+            original_label(y0[i], y1[i], avg_sizes[i], features[i], matches[i], thresholds)
+            for i in range(n_lines)
+        ]
+        for name, label_lines in implementations:
+            labels = label_lines(y0, y1, avg_sizes, features, matches, pattern_bits, thresholds)
+            assert labels.dtype == np.int8, f"{name} returned {labels.dtype}"
+            assert labels.tolist() == expected, f"{name} labels differ in trial {trial}"
+    
+    print(f"✓ {', '.join(name for name, _ in implementations)} match the original rule order")
+    return True
+
+
+def test_camelot_text_edges_patch():
+    """Test that the patched Camelot text edge search builds the same edges"""
+    print("\nTesting Camelot text edge patch...")
+    
+    try:
+        from camelot.core import TextEdges
+    except ImportError:
+        print("⚠ Camelot not installed, skipping")
+        return True
+    
+    import random
+    from pdf_pipeline.extractors import _camelot_patches
+    
+    # Importing the table extractor patches TextEdges in place; compare fresh subclasses
+    original_methods = getattr(TextEdges, '_unpatched', None) or {
+        'find': TextEdges.find, 'update': TextEdges.update
+    }
+    OriginalEdges = type('OriginalEdges', (TextEdges,), dict(original_methods))
+    PatchedEdges = type('PatchedEdges', (TextEdges,), {})
+    if not _camelot_patches.patch_text_edges(PatchedEdges):
+        print("⚠ Installed Camelot's TextEdges is not patched, skipping")
+        return True
+    
+    class TextLine:
+        def __init__(self, x0, x1, y0, y1, text):
+            self.x0, self.x1, self.y0, self.y1 = x0, x1, y0, y1
+            self.text = text
+        
+        def get_text(self):
+            return self.text
+    
+    def edge_summary(text_edges):
+        return {
+            align: [(te.x, te.y0, te.y1, te.intersections, te.is_valid) for te in edges]
+            for align, edges in text_edges._textedges.items()
+        }
+    
+    rng = random.Random(0)
+    for trial in range(100):
+        # Columns on a coarse grid with sub-tolerance jitter, so lines keep joining
+        # edges whose running mean x drifts, plus some stray lines
+        columns = [rng.uniform(20, 500) for _ in range(rng.randint(1, 8))]
+        textlines = []
+        y = 800.0
+        for _ in range(rng.randint(0, 300)):
+            y -= rng.choice([0.0, 8.0, 12.0, 60.0])
+            x0 = rng.choice(columns) + rng.uniform(-0.6, 0.6) if rng.random() < 0.8 else rng.uniform(0, 600)
+            x1 = x0 + rng.choice([20.0, 35.5, 50.0]) + rng.uniform(-0.6, 0.6)
+            text = rng.choice(["", "x", "12", "value", " a "])
+            textlines.append(TextLine(x0, x1, y, y + 10.0, text))
+        
+        original = OriginalEdges(edge_tol=50)
+        original.generate(textlines)
+        patched = PatchedEdges(edge_tol=50)
+        patched.generate(textlines)
+        assert edge_summary(patched) == edge_summary(original), f"text edges differ in trial {trial}"
+    
+    print("✓ Patched text edges match Camelot's own on random text lines")
+    return True
+
+
+def test_bbox_kernels_parity():
+    """Test that the batched bbox helpers agree with the scalar PDFUtils helpers"""
+    print("\nTesting batched bbox helpers...")
+    
+    import numpy as np
+    from unittest import mock
+    from pdf_pipeline.utils import _bbox_kernels
+    from pdf_pipeline.utils.pdf_utils import PDFUtils
+    
+    # NumPy broadcasting, the IoU kernel as compiled (if Numba is installed) and uncompiled
+    variants = [('numpy', False, None), ('kernels', True, None)]
+    if _bbox_kernels.NUMBA_AVAILABLE:
+        variants.append(('kernels (uncompiled)', True, 'py_func'))
+    
+    rng = np.random.default_rng(0)
+    for trial in range(300):
+        # Integer grids give touching, nested, identical and zero-area boxes;
+        # some boxes are inverted (x1 < x0), which the scalar helpers accept too
+        boxes = []
+        for n in rng.integers(0, 10, 2):
+            corners = rng.integers(0, 20, (n, 2)).astype(np.float64)
+            sizes = rng.integers(-2, 8, (n, 2)).astype(np.float64)
+            boxes.append(np.hstack([corners, corners + sizes]))
+        a, b = boxes
+        
+        shape = (len(a), len(b))
+        expected_overlap = np.array([[PDFUtils.bbox_overlap(p, q) for q in b] for p in a]).reshape(shape)
+        expected_iou = np.array([[PDFUtils.bbox_overlap_ratio(p, q) for q in b] for p in a]).reshape(shape)
+        
+        for name, use_kernels, attribute in variants:
+            kernel = _bbox_kernels.pairwise_iou
+            if attribute:
+                kernel = getattr(kernel, attribute)
+            with mock.patch.object(_bbox_kernels, 'NUMBA_AVAILABLE', use_kernels), \
+                    mock.patch.object(_bbox_kernels, 'pairwise_iou', kernel):
+                overlap = PDFUtils.pairwise_overlap_np(a, b)
+                iou = PDFUtils.pairwise_iou_np(a, b)
+            
+            assert overlap.shape == iou.shape == shape, f"{name} shapes differ"
+            assert np.allclose(overlap, expected_overlap, rtol=1e-12, atol=0), f"{name} overlap differs in trial {trial}"
+            assert np.allclose(iou, expected_iou, rtol=1e-12, atol=0), f"{name} IoU differs in trial {trial}"
+    
+    print(f"✓ {', '.join(name for name, _, _ in variants)} match bbox_overlap and bbox_overlap_ratio")
+    return True
+
+
 def main():
     """Run all tests"""
     print("Academic PDF Processing Pipeline - Test Suite")
@@ -202,6 +449,10 @@ def main():
         ("Processor Initialization Test", test_processor_initialization),
         ("CLI Availability Test", test_cli_availability),
         ("Example Script Test", test_example_script),
+        ("Pattern Set Parity Test", test_pattern_set_parity),
+        ("Line Labelling Parity Test", test_label_lines_parity),
+        ("Camelot Text Edge Patch Test", test_camelot_text_edges_patch),
+        ("Bbox Kernel Parity Test", test_bbox_kernels_parity),
     ]
     
     passed = 0